@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Peak memory benchmark for device listing.
+Compares the old decode-everything device listing with the streaming
+listing in UtecLockApi against a simulated account.
+"""
+
+import json
+import sys
+import tracemalloc
+
+from integration_loader import import_integration_module
+
+
+def build_body(device_count, lock_ratio):
+    """Build a Uhome.Device.List response body."""
+    devices = []
+    for i in range(device_count):
+        devices.append({
+            "id": f"device-{i:06d}",
+            "name": f"Unit {i} Front Door",
+            "type": "lock" if i % lock_ratio == 0 else "light",
+            "model": "U-Bolt Pro WiFi",
+            "firmware_version": "1.2.3",
+            "attributes": {"room": f"Building {i // 100}", "tags": ["site-a", "managed"]},
+        })
+    return json.dumps({
+        "header": {"namespace": "Uhome.Device", "name": "List", "payloadVersion": "1"},
+        "payload": {"devices": devices},
+    }).encode()
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body):
+        self._body = body
+
+    @property
+    def content(self):
+        return self._body
+
+    @property
+    def text(self):
+        return self._body.decode()
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Session serving the simulated device list and a fixed status."""
+
+    def __init__(self, body):
+        self.headers = {}
+        self._body = body
+        self._status = json.dumps({"payload": {"online": True, "states": [
+            {"capability": "st.Lock", "value": "locked"},
+        ]}}).encode()
+
+    def post(self, url, json=None, **kwargs):
+        if json["header"]["name"] == "List":
+            return FakeResponse(self._body)
+        return FakeResponse(self._status)
+
+    def close(self):
+        pass
+
+
+def legacy_get_devices_with_status(api):
+    """The device listing as it was before streaming was added."""
+    response = api.session.post(None, json={"header": {"name": "List"}})
+    api.devices = response.json().get("payload", {}).get("devices", [])
+    devices_with_status = {}
+    for device in api.devices:
+        device_id = device.get("id")
+        if device_id:
+            device["status"] = api.get_device_status(device_id)
+            devices_with_status[device_id] = device
+    return devices_with_status
+
+
+def legacy_get_devices(api):
+    """The device list decode as it was before streaming was added."""
+    response = api.session.post(None, json={"header": {"name": "List"}})
+    return [
+        device for device in response.json().get("payload", {}).get("devices", [])
+        if device.get("type") == "lock"
+    ]
+
+
+def streaming_get_devices(api):
+    """The streaming device list with type filtering at ingest."""
+    return api.get_devices(device_type="lock")
+
+
+def measure(func, api):
+    """Return (result size, retained bytes, peak bytes) for one listing."""
+    api.devices = []
+    # Start every run cold so cached responses and fingerprints don't carry over
+    api._status_fingerprints.clear()
+    api.cache.clear()
+    tracemalloc.start()
+    result = func(api)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), retained, peak
+
+
+def main():
+    """Main function."""
+    device_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    lock_ratio = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    api_module = import_integration_module("api")
+    body = build_body(device_count, lock_ratio)
+    api = api_module.UtecLockApi("client", "secret", access_token="token")
+    api.session = FakeSession(body)
+
+    print(f"{device_count} devices, {len(body) / 1024:.0f} KiB response, 1 in {lock_ratio} is a lock")
+    for label, func in (
+        ("list before", legacy_get_devices),
+        ("list after", streaming_get_devices),
+        ("list+status before", legacy_get_devices_with_status),
+        ("list+status after", api_module.UtecLockApi.get_devices_with_status),
+    ):
+        count, retained, peak = measure(func, api)
+        print(
+            f"  {label:<18} {count:>6} devices kept, "
+            f"retained {retained / 1024 / 1024:6.2f} MiB, "
+            f"peak {peak / 1024 / 1024:6.2f} MiB, "
+            f"transient {(peak - retained) / 1024 / 1024:6.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
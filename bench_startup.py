@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Utec Lock integration.
+Times each setup phase outside Home Assistant against a traffic capture
+recorded with `utec_cli.py --record`, and compares setting up several
+accounts one after another with setting them up concurrently.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from integration_loader import import_integration_module
+
+
+def setup_account(api_module, capture, speed, fresh_token):
+    """Run the setup phases of one account, return their durations."""
+    phases = {}
+    started = time.perf_counter()
+
+    api = api_module.UtecLockApi(
+        "client",
+        "secret",
+        access_token="token",
+        refresh_token="refresh",
+        token_expires_at=time.time() + 3600 if fresh_token else None,
+    )
+    api.replay_traffic(capture, speed)
+    phases["create_client"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if not api.has_fresh_token():
+        api.authenticate()
+    phases["authenticate"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    api.get_devices_with_status()
+    phases["first_refresh"] = time.perf_counter() - started
+    return phases
+
+
+def print_phases(label, phases):
+    """Print one line of phase timings."""
+    parts = ", ".join(f"{phase} {seconds * 1000:7.1f} ms" for phase, seconds in phases.items())
+    print(f"  {label:<22} {parts}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Time integration setup phases against a capture.")
+    parser.add_argument("capture", help="JSON-lines capture with Check, List and Status requests")
+    parser.add_argument("--accounts", type=int, default=4, help="accounts to set up")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    api_module = import_integration_module("api")
+    import_api = time.perf_counter() - started
+
+    started = time.perf_counter()
+    import requests  # noqa: F401  first client pays for this
+    import_requests = time.perf_counter() - started
+    print(f"import api module {import_api * 1000:.1f} ms, deferred import of requests {import_requests * 1000:.1f} ms")
+
+    print("single account:")
+    print_phases("validation probe", setup_account(api_module, args.capture, args.speed, False))
+    print_phases("known-fresh token", setup_account(api_module, args.capture, args.speed, True))
+
+    print(f"{args.accounts} accounts:")
+    for fresh_token in (False, True):
+        label = "known-fresh token" if fresh_token else "validation probe"
+
+        started = time.perf_counter()
+        for _ in range(args.accounts):
+            setup_account(api_module, args.capture, args.speed, fresh_token)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.accounts) as executor:
+            list(executor.map(
+                lambda _: setup_account(api_module, args.capture, args.speed, fresh_token),
+                range(args.accounts),
+            ))
+        concurrent = time.perf_counter() - started
+        print_phases(label, {"sequential": sequential, "concurrent": concurrent})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 """The Utec Lock integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from functools import partial
+
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
@@ -9,13 +13,17 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.loader import async_get_integration
 
 from .api import UtecLockApi
-from .const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN, PLATFORMS
-from .coordinator import UtecLockDataUpdateCoordinator
+from .const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN
+from .coordinator import UtecLockDataUpdateCoordinator, async_update_tokens
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = [Platform.LOCK, Platform.SENSOR]
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -31,6 +39,8 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Utec Lock component from YAML."""
+    async_setup_services(hass)
+
     if DOMAIN not in config:
         return True
 
@@ -54,40 +64,70 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Utec Lock from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-
-    api = UtecLockApi(
-        client_id=entry.data[CONF_CLIENT_ID],
-        client_secret=entry.data[CONF_CLIENT_SECRET],
-        access_token=entry.data.get("access_token"),
-        refresh_token=entry.data.get("refresh_token"),
+    startup: dict[str, float | None] = {}
+    started = time.perf_counter()
+
+    # Creating the client imports requests, keep that off the event loop
+    api = await hass.async_add_executor_job(
+        partial(
+            UtecLockApi,
+            client_id=entry.data[CONF_CLIENT_ID],
+            client_secret=entry.data[CONF_CLIENT_SECRET],
+            access_token=entry.data.get("access_token"),
+            refresh_token=entry.data.get("refresh_token"),
+            token_expires_at=entry.data.get("expires_at"),
+        )
     )
+    started = _record_phase(startup, "create_client", started)
 
     if not api.access_token:
         _LOGGER.warning("No access token in config entry, attempting to authenticate")
-    
-    # Authenticate with the API
-    authenticated = await hass.async_add_executor_job(api.authenticate)
-    if not authenticated:
-        _LOGGER.error("Failed to authenticate with Utec API")
-        return False
 
+    if api.has_fresh_token():
+        # The token should be valid; a 401 on the first refresh still refreshes it
+        startup["authenticate"] = None
+    else:
+        authenticated = await hass.async_add_executor_job(api.authenticate)
+        if not authenticated:
+            _LOGGER.error("Failed to authenticate with Utec API")
+            return False
+        async_update_tokens(hass, entry, api)
+        started = _record_phase(startup, "authenticate", started)
+
+    # Load the platform modules while the device inventory is fetched
     coordinator = UtecLockDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    integration = await async_get_integration(hass, DOMAIN)
+    await asyncio.gather(
+        coordinator.async_config_entry_first_refresh(),
+        integration.async_get_platforms(PLATFORMS),
+    )
+    started = _record_phase(startup, "first_refresh", started)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "startup": startup,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _record_phase(startup, "platform_setup", started)
+    _LOGGER.debug("Setup of %s took %s", entry.title, startup)
 
     return True
 
 
+def _record_phase(startup: dict[str, float | None], phase: str, started: float) -> float:
+    """Store the duration of a setup phase and return the current time."""
+    now = time.perf_counter()
+    startup[phase] = round(now - started, 4)
+    return now
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
+            await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_shutdown()
             api = hass.data[DOMAIN][entry.entry_id]["api"]
             if hasattr(api, "session") and api.session:
                 await hass.async_add_executor_job(api.session.close)
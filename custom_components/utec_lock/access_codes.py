@@ -0,0 +1,190 @@
+"""Access code management for Utec Lock integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from .const import (
+    ACCESS_CODE_ADD,
+    ACCESS_CODE_CACHE_TTL,
+    ACCESS_CODE_DELETE,
+    ACCESS_CODE_UPDATE,
+    ACCESS_CODE_WRITE_INTERVAL,
+    DEVICE_PAGE_SIZE,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .api import UtecLockApi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def compute_diff(
+    current: Dict[str, Dict[str, Any]], desired: Dict[str, str], remove_unlisted: bool
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return the (command, arguments) that turn current codes into desired ones.
+
+    current maps code name to {"id": slot id, "code": code}. Removals come
+    first so they free slots for the additions.
+    """
+    operations = []
+    if remove_unlisted:
+        for name, existing in current.items():
+            if name not in desired:
+                operations.append((ACCESS_CODE_DELETE, {"id": existing["id"]}))
+    for name, code in desired.items():
+        existing = current.get(name)
+        if existing is None:
+            continue
+        if existing["code"] != code:
+            operations.append(
+                (ACCESS_CODE_UPDATE, {"id": existing["id"], "name": name, "password": code})
+            )
+    for name, code in desired.items():
+        if name not in current:
+            operations.append((ACCESS_CODE_ADD, {"name": name, "password": code}))
+    return operations
+
+
+class AccessCodeManager:
+    """Keep lock access codes in sync with a desired set.
+
+    Current codes are fetched once per lock and cached for
+    ACCESS_CODE_CACHE_TTL seconds, so a sync that changes nothing sends no
+    write requests. Codes changed in the U-tec app show up once the cache
+    expires, or right away when a sync asks for a refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: UtecLockApi) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._api = api
+        # device_id -> code name -> {"id": slot id, "code": code}
+        self._codes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # device_id -> monotonic time its codes were fetched
+        self._fetched: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        self.write_requests = 0
+
+    def summary(self) -> Dict[str, int]:
+        """Return the number of cached codes per lock."""
+        return {device_id: len(codes) for device_id, codes in self._codes.items()}
+
+    async def async_sync(
+        self,
+        device_ids: List[str],
+        desired: Dict[str, str],
+        remove_unlisted: bool = False,
+        refresh: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Bring the codes of the given locks to the desired set.
+
+        With refresh, cached codes are fetched again before the diff.
+
+        Operations are sent in rounds: each round holds at most one operation
+        per lock, batched into requests of DEVICE_PAGE_SIZE locks, with
+        ACCESS_CODE_WRITE_INTERVAL seconds between requests.
+        """
+        async with self._lock:
+            results = {
+                device_id: {"added": 0, "updated": 0, "removed": 0, "failed": 0}
+                for device_id in device_ids
+            }
+
+            now = time.monotonic()
+            for device_id in device_ids:
+                if refresh or now - self._fetched.get(device_id, now) > ACCESS_CODE_CACHE_TTL:
+                    self._forget(device_id)
+
+            if missing := [device_id for device_id in device_ids if device_id not in self._codes]:
+                # Errors propagate; the service reports them
+                fetched = await self._hass.async_add_executor_job(
+                    self._api.get_access_codes, missing
+                )
+                for device_id, users in fetched.items():
+                    self._fetched[device_id] = now
+                    self._codes[device_id] = {
+                        user.get("name"): {"id": user.get("id"), "code": user.get("password")}
+                        for user in users
+                    }
+
+            plans = {}
+            for device_id in device_ids:
+                if device_id not in self._codes:
+                    results[device_id]["error"] = "access codes unavailable"
+                    continue
+                plans[device_id] = compute_diff(self._codes[device_id], desired, remove_unlisted)
+
+            failed: set[str] = set()
+            refetch: set[str] = set()
+            first_request = True
+            for index in range(max((len(ops) for ops in plans.values()), default=0)):
+                batch = [
+                    (device_id, *operations[index])
+                    for device_id, operations in plans.items()
+                    if index < len(operations) and device_id not in failed
+                ]
+                for start in range(0, len(batch), DEVICE_PAGE_SIZE):
+                    if not first_request:
+                        await asyncio.sleep(ACCESS_CODE_WRITE_INTERVAL)
+                    first_request = False
+                    chunk = batch[start:start + DEVICE_PAGE_SIZE]
+                    await self._async_send(chunk, results, failed, refetch)
+
+            for device_id in failed | refetch:
+                # Cached codes are incomplete, fetch again next time
+                self._forget(device_id)
+
+            return results
+
+    def _forget(self, device_id: str) -> None:
+        """Drop the cached codes of a lock."""
+        self._codes.pop(device_id, None)
+        self._fetched.pop(device_id, None)
+
+    async def _async_send(
+        self,
+        chunk: List[Tuple[str, str, Dict[str, Any]]],
+        results: Dict[str, Dict[str, Any]],
+        failed: set[str],
+        refetch: set[str],
+    ) -> None:
+        """Send one batched write request and record its outcome."""
+        self.write_requests += 1
+        try:
+            responses = await self._hass.async_add_executor_job(
+                self._api.send_access_code_commands, chunk
+            )
+        except Exception as err:
+            _LOGGER.warning("Error sending access code commands: %s", err)
+            responses = None
+
+        for device_id, command, arguments in chunk:
+            entry = None if responses is None else responses.get(device_id)
+            if entry is None or "error" in entry:
+                # Missing from the response counts as not applied, like an
+                # error; later operations for this lock are skipped
+                results[device_id]["failed"] += 1
+                failed.add(device_id)
+                continue
+
+            codes = self._codes[device_id]
+            if command == ACCESS_CODE_ADD:
+                slot_id = entry.get("user", {}).get("id")
+                codes[arguments["name"]] = {"id": slot_id, "code": arguments["password"]}
+                if slot_id is None:
+                    # Without the new slot id later edits need a fresh fetch
+                    refetch.add(device_id)
+                results[device_id]["added"] += 1
+            elif command == ACCESS_CODE_UPDATE:
+                codes[arguments["name"]]["code"] = arguments["password"]
+                results[device_id]["updated"] += 1
+            else:
+                for name, existing in list(codes.items()):
+                    if existing["id"] == arguments["id"]:
+                        del codes[name]
+                results[device_id]["removed"] += 1
@@ -1,25 +1,202 @@
 """API client for Utec Lock integration."""
+import codecs
+import hashlib
+import json
 import logging
+import threading
+import time
 import uuid
-from typing import Any, Dict, List
-import requests
-from .const import API_URL
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+from .cache import ResponseCache
+from .const import (
+    ACCESS_CODE_CAPABILITY,
+    ACCESS_CODE_LIST,
+    API_URL,
+    CACHE_KIND_DEVICES,
+    CACHE_KIND_STATUS,
+    CACHE_MAX_DEVICE_LISTS,
+    CACHE_MAX_STATUSES,
+    CACHE_TTL_DEVICES,
+    CACHE_TTL_STATUS,
+    DEVICE_METADATA_FIELDS,
+    DEVICE_PAGE_SIZE,
+    LOCK_DEVICE_TYPE,
+    STREAM_CHUNK_SIZE,
+    TOKEN_EXPIRY_MARGIN,
+)
+
+if TYPE_CHECKING:
+    import requests
 
 _LOGGER = logging.getLogger(__name__)
 
+_JSON_WHITESPACE = " \t\r\n"
+_ABSENT = object()
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Decode the elements of the first ``key`` array from a stream of JSON chunks.
+
+    Only the element currently being decoded is held in memory, so a device
+    list of any size is never materialized as a whole.
+    """
+    # Each element is decoded on its own, which loses the decoder's key memo,
+    # so share key strings across elements to keep per-device overhead flat.
+    keys: Dict[str, str] = {}
+    decoder = json.JSONDecoder(
+        object_pairs_hook=lambda pairs: {keys.setdefault(k, k): v for k, v in pairs}
+    )
+    text = codecs.getincrementaldecoder("utf-8")()
+    marker = f'"{key}"'
+    buffer = ""
+    pos = 0
+    in_array = False
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+
+        while not in_array:
+            start = buffer.find(marker, pos)
+            if start == -1:
+                # Keep enough of the tail to match a marker split across chunks
+                pos = max(pos, len(buffer) - len(marker))
+                break
+            value = start + len(marker)
+            while value < len(buffer) and buffer[value] in _JSON_WHITESPACE + ":":
+                value += 1
+            if value >= len(buffer):
+                pos = start
+                break
+            if buffer[value] == "[" and ":" in buffer[start + len(marker):value]:
+                pos = value + 1
+                in_array = True
+            else:
+                # The key text appeared as a string value or mapped to a non-array
+                pos = start + 1
+        if not in_array:
+            continue
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE + ",":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is split across chunks, wait for more data
+                break
+            if buffer[pos] not in '{["' and (
+                end == len(buffer) or buffer[end] not in _JSON_WHITESPACE + ",]"
+            ):
+                # A number can be cut short by the chunk boundary ("-4." decodes
+                # as -4), so only trust it once the delimiter after it arrived
+                break
+            pos = end
+            yield item
+
+    if in_array:
+        raise ValueError(f"Truncated JSON array for key {key!r}")
+
+
+def _status_from_query(device: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a Uhome.Device.Query entry like a Uhome.Device.Status payload."""
+    status = {key: value for key, value in device.items() if key != "id"}
+    # A device that answers a query is reachable
+    status.setdefault("online", True)
+    return status
+
+
+def _device_metadata(device: Dict[str, Any]) -> tuple:
+    """Return the metadata fields of a device as a compact tuple."""
+    return tuple(device.get(field, _ABSENT) for field in DEVICE_METADATA_FIELDS)
+
+
+def _device_from_metadata(metadata: tuple) -> Dict[str, Any]:
+    """Rebuild a device dict from _device_metadata, leaving out absent fields."""
+    return {
+        field: value
+        for field, value in zip(DEVICE_METADATA_FIELDS, metadata)
+        if value is not _ABSENT
+    }
+
+
 class UtecLockApi:
     """API client for Utec Lock integration."""
 
-    def __init__(self, client_id: str, client_secret: str, access_token: str = None, refresh_token: str = None):
-        """Initialize the API client."""
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        access_token: str = None,
+        refresh_token: str = None,
+        token_expires_at: Optional[float] = None,
+    ):
+        """Initialize the API client.
+
+        requests is imported here rather than at module level so loading the
+        integration stays cheap; create the client in the executor.
+        """
+        import requests
+
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = access_token
         self.refresh_token = refresh_token
+        # Unix time the access token expires, when known
+        self.token_expires_at = token_expires_at
         self.session = requests.Session()
+        self._refresh_lock = threading.Lock()
         if access_token:
             self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
         self.devices = []
+        # Device lists and statuses, reused within their TTL without a request
+        self.cache = ResponseCache(
+            {CACHE_KIND_DEVICES: CACHE_TTL_DEVICES, CACHE_KIND_STATUS: CACHE_TTL_STATUS},
+            {CACHE_KIND_DEVICES: CACHE_MAX_DEVICE_LISTS, CACHE_KIND_STATUS: CACHE_MAX_STATUSES},
+        )
+        # device_id -> monotonic time the returned status was fetched, which
+        # is earlier than the call when it came from the cache
+        self.status_fetched: Dict[str, float] = {}
+        # Time spent waiting for response headers, across all requests
+        self.network_seconds = 0.0
+        self.session.hooks["response"].append(self._count_network_time)
+        # device_id -> (fingerprint, ETag, decoded status) of the last status response
+        self._status_fingerprints: Dict[str, tuple] = {}
+        self.fingerprint_stats = {
+            "hits": 0,
+            "misses": 0,
+            "decode_seconds": 0.0,
+            "saved_seconds": 0.0,
+            "last_cycle": {"hits": 0, "misses": 0, "saved_seconds": 0.0},
+        }
+
+    def _count_network_time(self, response: "requests.Response", *args: Any, **kwargs: Any) -> None:
+        """Accumulate how long each request waited on the network."""
+        self.network_seconds += response.elapsed.total_seconds()
+
+    def record_traffic(self, path: str) -> None:
+        """Record redacted request/response pairs to a JSON-lines capture."""
+        from .transport import RecordingAdapter
+
+        self.session.mount("https://", RecordingAdapter(path))
+
+    def replay_traffic(self, path: str, speed: Optional[float] = 1.0) -> None:
+        """Serve all requests from a capture made with record_traffic."""
+        from .transport import ReplayAdapter
+
+        self.session.mount("https://", ReplayAdapter(path, speed))
+
+    def has_fresh_token(self, margin: float = TOKEN_EXPIRY_MARGIN) -> bool:
+        """Return True if the access token is known to stay valid for margin seconds."""
+        return bool(
+            self.access_token
+            and self.token_expires_at
+            and self.token_expires_at - margin > time.time()
+        )
 
     def authenticate(self) -> bool:
         """Authenticate with the API using existing tokens or refresh token if needed."""
@@ -71,6 +248,8 @@ class UtecLockApi:
             result = response.json()
             self.access_token = result.get("access_token")
             self.refresh_token = result.get("refresh_token", self.refresh_token)
+            expires_in = result.get("expires_in")
+            self.token_expires_at = time.time() + expires_in if expires_in else None
             self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
             _LOGGER.debug("Token refreshed successfully")
             return True
@@ -78,8 +257,41 @@ class UtecLockApi:
             _LOGGER.error("Failed to refresh access token: %s", e)
             return False
 
-    def get_devices(self) -> List[Dict[str, Any]]:
-        """Get list of devices."""
+    def _post(self, body: Dict[str, Any], **kwargs: Any) -> "requests.Response":
+        """Post an action, refreshing the token and retrying once on 401.
+
+        A token that expired or was revoked early is only noticed here when
+        setup trusted its stored expiry and skipped authenticate().
+        """
+        token = self.access_token
+        response = self.session.post(API_URL, json=body, **kwargs)
+        if response.status_code != 401 or not self.refresh_token:
+            return response
+
+        with self._refresh_lock:
+            # Another thread may have refreshed while this request was in flight
+            refreshed = self.access_token != token or self.refresh_access_token()
+        if not refreshed:
+            return response
+
+        _LOGGER.debug("Access token rejected, retrying with a refreshed token")
+        response.close()
+        return self.session.post(API_URL, json=body, **kwargs)
+
+    def iter_devices(self, device_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream devices from the device list, optionally keeping a single type.
+
+        A fully read list is cached per device type as compact tuples of
+        DEVICE_METADATA_FIELDS, so devices served from the cache carry only
+        those fields.
+        """
+        cached = self.cache.get(CACHE_KIND_DEVICES, device_type)
+        if cached is not None:
+            _LOGGER.debug("Using cached device list")
+            for metadata in cached:
+                yield _device_from_metadata(metadata)
+            return
+
         device_request = {
             "header": {
                 "namespace": "Uhome.Device",
@@ -90,16 +302,48 @@ class UtecLockApi:
             "payload": {}
         }
 
-        try:
-            _LOGGER.debug("Getting devices from Utec API")
-            response = self.session.post(API_URL, json=device_request)
+        _LOGGER.debug("Getting devices from Utec API")
+        response = self._post(device_request, stream=True)
 
+        try:
             if response.status_code != 200:
                 _LOGGER.error("Failed to get devices: %s", response.text)
-                return []
+                # An empty list would pass for an account without locks
+                response.raise_for_status()
+                raise ValueError(f"Unexpected status {response.status_code} listing devices")
 
-            result = response.json()
-            self.devices = result.get("payload", {}).get("devices", [])
+            devices = []
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            for device in iter_json_array(chunks, "devices"):
+                if device_type is None or device.get("type") == device_type:
+                    devices.append(_device_metadata(device))
+                    yield device
+            # Only reached when the caller consumed the whole list
+            self.cache.set(CACHE_KIND_DEVICES, device_type, devices)
+        finally:
+            response.close()
+
+    def iter_device_pages(
+        self, page_size: int = DEVICE_PAGE_SIZE, device_type: Optional[str] = LOCK_DEVICE_TYPE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream devices in pages of at most ``page_size`` entries.
+
+        The U-tec device list is not paginated server side, so pages are cut
+        client side while the response is still being decoded.
+        """
+        page = []
+        for device in self.iter_devices(device_type):
+            page.append(device)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def get_devices(self, device_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get list of devices."""
+        try:
+            self.devices = list(self.iter_devices(device_type))
             _LOGGER.debug("Found %s devices", len(self.devices))
             return self.devices
 
@@ -108,7 +352,12 @@ class UtecLockApi:
             return []
 
     def get_device_status(self, device_id: str) -> Dict[str, Any]:
-        """Get device status."""
+        """Get device status, reusing a cached one younger than its TTL."""
+        if cached := self.cache.lookup(CACHE_KIND_STATUS, device_id):
+            self.status_fetched[device_id] = cached[0]
+            return cached[1]
+        self.status_fetched[device_id] = time.monotonic()
+
         status_request = {
             "header": {
                 "namespace": "Uhome.Device",
@@ -121,32 +370,181 @@ class UtecLockApi:
             }
         }
 
+        cached = self._status_fingerprints.get(device_id)
+        headers = {"If-None-Match": cached[1]} if cached and cached[1] else None
+
         try:
             _LOGGER.debug("Getting status for device %s", device_id)
-            response = self.session.post(API_URL, json=status_request)
+            response = self._post(status_request, headers=headers)
+
+            if response.status_code == 304 and cached:
+                self.cache.set(CACHE_KIND_STATUS, device_id, cached[2])
+                return self._fingerprint_hit(cached[2])
 
             if response.status_code != 200:
                 _LOGGER.error("Failed to get device status: %s", response.text)
                 return {}
 
-            return response.json().get("payload", {})
+            # The response echoes our messageId, so leave it out of the fingerprint
+            body = response.content.replace(status_request["header"]["messageId"].encode(), b"")
+            fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+            if cached and cached[0] == fingerprint:
+                self.cache.set(CACHE_KIND_STATUS, device_id, cached[2])
+                return self._fingerprint_hit(cached[2])
+
+            started = time.perf_counter()
+            status = response.json().get("payload", {})
+            self._fingerprint_miss(time.perf_counter() - started)
+            self._status_fingerprints[device_id] = (
+                fingerprint, response.headers.get("ETag"), status
+            )
+            self.cache.set(CACHE_KIND_STATUS, device_id, status)
+            return status
 
         except Exception as e:
             _LOGGER.error("Exception while getting device status: %s", e)
             return {}
 
+    def query_devices(
+        self, device_ids: List[str], max_age: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Query the status of specific devices in batches.
+
+        Cached statuses no older than max_age seconds (default: the status
+        TTL) are reused; pass 0 to query every device.
+        """
+        statuses = {}
+        for device_id in device_ids:
+            if cached := self.cache.lookup(CACHE_KIND_STATUS, device_id, max_age):
+                self.status_fetched[device_id], statuses[device_id] = cached
+        device_ids = [device_id for device_id in device_ids if device_id not in statuses]
+
+        for start in range(0, len(device_ids), DEVICE_PAGE_SIZE):
+            query_request = {
+                "header": {
+                    "namespace": "Uhome.Device",
+                    "name": "Query",
+                    "messageId": str(uuid.uuid4()),
+                    "payloadVersion": "1"
+                },
+                "payload": {
+                    "devices": [{"id": device_id} for device_id in device_ids[start:start + DEVICE_PAGE_SIZE]]
+                }
+            }
+
+            _LOGGER.debug("Querying status for %s devices", len(query_request["payload"]["devices"]))
+            fetched = time.monotonic()
+            response = self._post(query_request)
+            response.raise_for_status()
+
+            for device in response.json().get("payload", {}).get("devices", []):
+                device_id = device.get("id")
+                if device_id:
+                    statuses[device_id] = _status_from_query(device)
+                    self.status_fetched[device_id] = fetched
+                    self.cache.set(CACHE_KIND_STATUS, device_id, statuses[device_id])
+
+        return statuses
+
+    def _fingerprint_hit(self, status: Dict[str, Any]) -> Dict[str, Any]:
+        """Count an unchanged status response and return the cached status."""
+        stats = self.fingerprint_stats
+        saved = stats["decode_seconds"] / stats["misses"] if stats["misses"] else 0.0
+        stats["hits"] += 1
+        stats["saved_seconds"] += saved
+        stats["last_cycle"]["hits"] += 1
+        stats["last_cycle"]["saved_seconds"] += saved
+        return status
+
+    def _fingerprint_miss(self, decode_seconds: float) -> None:
+        """Count a changed status response that had to be decoded."""
+        stats = self.fingerprint_stats
+        stats["misses"] += 1
+        stats["decode_seconds"] += decode_seconds
+        stats["last_cycle"]["misses"] += 1
+
+    def _device_commands(self, commands: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Send a Uhome.Device.Command request for several devices at once."""
+        command_request = {
+            "header": {
+                "namespace": "Uhome.Device",
+                "name": "Command",
+                "messageId": str(uuid.uuid4()),
+                "payloadVersion": "1"
+            },
+            "payload": {
+                "devices": commands
+            }
+        }
+
+        response = self._post(command_request)
+        response.raise_for_status()
+        return {
+            device.get("id"): device
+            for device in response.json().get("payload", {}).get("devices", [])
+        }
+
+    def get_access_codes(self, device_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the access codes of locks, batched by DEVICE_PAGE_SIZE.
+
+        Locks missing from the response are left out of the result.
+        """
+        codes = {}
+        for start in range(0, len(device_ids), DEVICE_PAGE_SIZE):
+            page = device_ids[start:start + DEVICE_PAGE_SIZE]
+            _LOGGER.debug("Getting access codes for %s devices", len(page))
+            results = self._device_commands([
+                {"id": device_id, "command": {"capability": ACCESS_CODE_CAPABILITY, "name": ACCESS_CODE_LIST}}
+                for device_id in page
+            ])
+            for device_id in page:
+                if device_id in results and "error" not in results[device_id]:
+                    codes[device_id] = results[device_id].get("users", [])
+        return codes
+
+    def send_access_code_commands(
+        self, commands: List[tuple]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Send (device_id, command, arguments) access code commands in one request.
+
+        Returns the per-device response entries; a device whose entry has an
+        "error" key was not changed.
+        """
+        _LOGGER.debug("Sending %s access code commands", len(commands))
+        self.cache.invalidate(CACHE_KIND_STATUS, {device_id for device_id, _, _ in commands})
+        return self._device_commands([
+            {
+                "id": device_id,
+                "command": {"capability": ACCESS_CODE_CAPABILITY, "name": command, "arguments": arguments},
+            }
+            for device_id, command, arguments in commands
+        ])
+
     def get_devices_with_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get all devices with their status."""
-        devices = self.get_devices()
+        """Get all lock devices with their status.
+
+        Devices carry DEVICE_METADATA_FIELDS and "status"; status_fetched
+        holds when each status was fetched.
+        """
         devices_with_status = {}
+        self.fingerprint_stats["last_cycle"] = {"hits": 0, "misses": 0, "saved_seconds": 0.0}
 
-        for device in devices:
-            device_id = device.get("id")
-            if device_id:
-                status = self.get_device_status(device_id)
-                device["status"] = status
-                devices_with_status[device_id] = device
+        # Errors propagate so a failed listing is not mistaken for no locks
+        for page in self.iter_device_pages():
+            for device in page:
+                device_id = device.get("id")
+                if device_id:
+                    # Keep the same fields whether the list came from the cache or not
+                    record = _device_from_metadata(_device_metadata(device))
+                    record["status"] = self.get_device_status(device_id)
+                    devices_with_status[device_id] = record
 
+        self.devices = list(devices_with_status.values())
+        for device_id in self._status_fingerprints.keys() - devices_with_status.keys():
+            del self._status_fingerprints[device_id]
+        for device_id in self.status_fetched.keys() - devices_with_status.keys():
+            del self.status_fetched[device_id]
+        _LOGGER.debug("Found %s lock devices", len(self.devices))
         return devices_with_status
 
     def lock(self, device_id: str) -> bool:
@@ -163,9 +561,11 @@ class UtecLockApi:
             }
         }
 
+        # Whatever the outcome, the cached status can no longer be trusted
+        self.cache.invalidate(CACHE_KIND_STATUS, [device_id])
         try:
             _LOGGER.debug("Locking device %s", device_id)
-            response = self.session.post(API_URL, json=lock_request)
+            response = self._post(lock_request)
 
             if response.status_code != 200:
                 _LOGGER.error("Failed to lock device: %s", response.text)
@@ -191,9 +591,10 @@ class UtecLockApi:
             }
         }
 
+        self.cache.invalidate(CACHE_KIND_STATUS, [device_id])
         try:
             _LOGGER.debug("Unlocking device %s", device_id)
-            response = self.session.post(API_URL, json=unlock_request)
+            response = self._post(unlock_request)
 
             if response.status_code != 200:
                 _LOGGER.error("Failed to unlock device: %s", response.text)
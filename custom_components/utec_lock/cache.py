@@ -0,0 +1,93 @@
+"""Response cache for Utec Lock integration."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class ResponseCache:
+    """Bounded LRU cache of API records with a TTL and size cap per kind.
+
+    Each kind has its own LRU order and cap, so a burst of one kind (a
+    status per lock) never evicts another (the device list). The API
+    client is called from executor threads, so every operation takes a
+    lock.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: Dict[str, int]) -> None:
+        """Initialize."""
+        self.ttls = ttls
+        self.max_entries = max_entries
+        # kind -> key -> (stored monotonic time, value), least recently used first
+        self._entries: Dict[str, "OrderedDict[Hashable, Tuple[float, Any]]"] = {
+            kind: OrderedDict() for kind in ttls
+        }
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(
+        self, kind: str, key: Hashable, max_age: Optional[float] = None
+    ) -> Optional[Tuple[float, Any]]:
+        """Return (stored monotonic time, value), or None when missing or too old.
+
+        max_age can only tighten the TTL of the kind, never extend it.
+        """
+        ttl = self.ttls[kind] if max_age is None else min(max_age, self.ttls[kind])
+        entries = self._entries[kind]
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > ttl:
+                self.misses += 1
+                if entry is not None and time.monotonic() - entry[0] > self.ttls[kind]:
+                    del entries[key]
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, kind: str, key: Hashable, max_age: Optional[float] = None) -> Any:
+        """Return a cached value, or None when missing or older than its TTL."""
+        entry = self.lookup(kind, key, max_age)
+        return None if entry is None else entry[1]
+
+    def set(self, kind: str, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries over the cap."""
+        entries = self._entries[kind]
+        with self._lock:
+            entries[key] = (time.monotonic(), value)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries[kind]:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, kind: str, keys: Iterable[Hashable]) -> None:
+        """Drop the entries of the given keys."""
+        entries = self._entries[kind]
+        with self._lock:
+            for key in keys:
+                if entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            for entries in self._entries.values():
+                self.invalidations += len(entries)
+                entries.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return counters and settings for diagnostics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": {kind: len(entries) for kind, entries in self._entries.items()},
+            "max_entries": dict(self.max_entries),
+            "ttls": dict(self.ttls),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
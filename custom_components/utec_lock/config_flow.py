@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
-import requests
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -27,6 +27,9 @@ STEP_CODE_DATA_SCHEMA = vol.Schema({
 
 def fetch_token(client_id: str, client_secret: str, code: str) -> dict[str, Any] | None:
     """Exchange authorization code for token."""
+    # Only needed while configuring, keep it out of integration loading
+    import requests
+
     token_url = "https://oauth.u-tec.com/token"
     payload = {
         "grant_type": "authorization_code",
@@ -99,6 +102,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         "access_token": token_data.get("access_token"),
                         "refresh_token": token_data.get("refresh_token"),
                         "expires_in": token_data.get("expires_in"),
+                        "expires_at": (
+                            time.time() + token_data["expires_in"]
+                            if token_data.get("expires_in")
+                            else None
+                        ),
                     },
                 )
 
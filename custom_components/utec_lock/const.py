@@ -1,5 +1,4 @@
 """Constants for the Utec Lock integration."""
-from homeassistant.const import Platform
 
 # Domain - must match what's in manifest.json
 DOMAIN = "utec_lock"
@@ -18,5 +17,63 @@ API_URL = "https://api.u-tec.com/action"
 # Default values
 DEFAULT_SCAN_INTERVAL = 30  # seconds
 
-# Platforms
-PLATFORMS = [Platform.LOCK, Platform.SENSOR]
\ No newline at end of file
+# Validate tokens that expire within this many seconds instead of trusting them
+TOKEN_EXPIRY_MARGIN = 300
+
+# Seconds after a command during which reaching the commanded st.Lock value confirms it
+COMMAND_CONFIRM_WINDOW = 120
+# Confirmed commands kept per device for latency percentiles
+COMMAND_LATENCY_SAMPLES = 50
+
+# Reconciliation: seconds before the first retry, doubled on each retry
+RECONCILE_GRACE = 15
+RECONCILE_MAX_RETRIES = 3
+
+# Access codes, managed through Uhome.Device.Command
+ACCESS_CODE_CAPABILITY = "st.lockUser"
+ACCESS_CODE_LIST = "list"
+ACCESS_CODE_ADD = "add"
+ACCESS_CODE_UPDATE = "update"
+ACCESS_CODE_DELETE = "delete"
+ACCESS_CODE_WRITE_INTERVAL = 1.0  # seconds between access code write requests
+ACCESS_CODE_CACHE_TTL = 3600  # seconds fetched codes are trusted before a refetch
+
+# Device listing
+LOCK_DEVICE_TYPE = "lock"
+LOCK_CAPABILITY = "st.Lock"
+DEVICE_PAGE_SIZE = 50  # devices handled per page of status work
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read per chunk of the device list
+
+# API response cache: seconds each kind of record is reused without a request.
+# Status stays below DEFAULT_SCAN_INTERVAL so every poll still reaches the lock.
+CACHE_KIND_DEVICES = "devices"
+CACHE_KIND_STATUS = "status"
+CACHE_TTL_DEVICES = 600
+CACHE_TTL_STATUS = 10
+# Each kind has its own cap: a few device lists (one per type filter) and a
+# status per lock for fleets well beyond a few thousand locks
+CACHE_MAX_DEVICE_LISTS = 4
+CACHE_MAX_STATUSES = 20000
+# Device fields kept in the cached device list and in coordinator data
+DEVICE_METADATA_FIELDS = ("id", "name", "type", "model", "firmware_version")
+
+# Services
+SERVICE_GET_STATUS = "get_status"
+SERVICE_PROFILE = "profile"
+SERVICE_SYNC_ACCESS_CODES = "sync_access_codes"
+ATTR_CODE = "code"
+ATTR_CODES = "codes"
+ATTR_CYCLES = "cycles"
+ATTR_DEVICE_ID = "device_id"
+ATTR_MAX_AGE = "max_age"
+ATTR_NAME = "name"
+ATTR_REFRESH = "refresh"
+ATTR_REMOVE_UNLISTED = "remove_unlisted"
+ATTR_STALE_WHILE_REVALIDATE = "stale_while_revalidate"
+
+# Events
+EVENT_LOCK_STATE_CHANGED = "utec_lock_state_changed"
+EVENT_LOCK_STUCK = "utec_lock_stuck"
+SOURCE_POLL = "poll"
+SOURCE_QUERY = "query"
+SOURCE_COMMAND = "command"
\ No newline at end of file
@@ -2,18 +2,58 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
-from typing import Any, Dict
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .access_codes import AccessCodeManager
 from .api import UtecLockApi
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_LOCK_STATE_CHANGED,
+    LOCK_CAPABILITY,
+    SOURCE_COMMAND,
+    SOURCE_POLL,
+    SOURCE_QUERY,
+)
+from .metrics import CommandLatencyTracker
+from .profiler import CoordinatorProfiler
+from .reconcile import LockReconciler
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _state_values(device: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Flatten a device's status into capability -> value."""
+    if not device:
+        return {}
+    status = device.get("status") or {}
+    values = {"online": status.get("online")}
+    for state in status.get("states", []):
+        values[state.get("capability")] = state.get("value")
+    return values
+
+
+@callback
+def async_update_tokens(hass: HomeAssistant, entry: ConfigEntry, api: UtecLockApi) -> None:
+    """Persist tokens that changed during authentication or a refresh."""
+    data = {
+        **entry.data,
+        "access_token": api.access_token,
+        "refresh_token": api.refresh_token,
+        "expires_at": api.token_expires_at,
+    }
+    if data != entry.data:
+        hass.config_entries.async_update_entry(entry, data=data)
+
+
 class UtecLockDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
@@ -21,19 +61,288 @@ class UtecLockDataUpdateCoordinator(DataUpdateCoordinator):
         """Initialize."""
         self.api = api
         self.platforms = []
+        # Monotonic time each device's status was last fetched
+        self.device_updated: Dict[str, float] = {}
+        self._revalidating: set[str] = set()
+        self.command_latency = CommandLatencyTracker()
+        self.profiler: CoordinatorProfiler | None = None
+        self.reconciler = LockReconciler(self)
+        self.access_codes = AccessCodeManager(hass, api)
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Unchanged statuses are reused as-is, so equal data skips listeners
+            always_update=False,
         )
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Update data via library."""
+        fetch = self.api.get_devices_with_status
+        if (profiler := self.profiler) is not None:
+            profiler.start_cycle()
+            fetch = profiler.wrap(fetch)
+
         try:
-            return await self.hass.async_add_executor_job(
-                self.api.get_devices_with_status
+            data = await self.hass.async_add_executor_job(fetch)
+        except Exception as exception:
+            raise UpdateFailed(f"Error communicating with API: {exception}") from exception
+        finally:
+            # Requests refresh a rejected token on their own
+            if self.config_entry is not None:
+                async_update_tokens(self.hass, self.config_entry, self.api)
+
+        with profiler.section() if profiler else nullcontext():
+            now = time.monotonic()
+            # A status served from the API cache is as old as its cache entry
+            fetched = self.api.status_fetched
+            device_updated = {}
+            for device_id, device in data.items():
+                old_device = (self.data or {}).get(device_id)
+                if not device.get("status") and old_device and old_device.get("status"):
+                    # The status request failed; keep the last known status
+                    # instead of reporting every capability as gone
+                    data[device_id] = {**device, "status": old_device["status"]}
+                    device_updated[device_id] = self.device_updated.get(device_id, now)
+                    continue
+                self._async_fire_transitions(device_id, old_device, device, SOURCE_POLL, now)
+                device_updated[device_id] = fetched.get(device_id, now)
+            self.device_updated = device_updated
+            self.reconciler.async_reconcile(data)
+        return data
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, then close the profiled cycle if one is running.
+
+        The cycle ends here rather than in _async_update_data so it covers
+        the fetch, committing the data and updating listeners.
+        """
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            self._async_finish_profile_cycle()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending work."""
+        self.reconciler.async_shutdown()
+        await super().async_shutdown()
+
+    @staticmethod
+    def reported_lock_state(device: Dict[str, Any] | None) -> str | None:
+        """Return the st.Lock value a device reports."""
+        return _state_values(device).get(LOCK_CAPABILITY)
+
+    async def async_send_command(self, device_id: str, command: str, retry: bool = False) -> bool:
+        """Send lock or unlock, timing it until the state is confirmed.
+
+        A retry continues the timing of the pending command, keeping the
+        first attempt's timestamps.
+        """
+        send = self.api.lock if command == "lock" else self.api.unlock
+        if retry:
+            timing = self.command_latency.resume(device_id, command)
+        else:
+            timing = self.command_latency.start(device_id, command)
+        first_attempt = timing.acked is None
+
+        def _send() -> bool:
+            if first_attempt:
+                timing.sent = time.monotonic()
+            result = send(device_id)
+            if first_attempt:
+                timing.acked = time.monotonic()
+            return result
+
+        result = await self.hass.async_add_executor_job(_send)
+        if not result and first_attempt:
+            self.command_latency.discard(device_id)
+        return result
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, profiling them when requested."""
+        if self.profiler is None:
+            super().async_update_listeners()
+            return
+
+        with self.profiler.section():
+            super().async_update_listeners()
+
+    @callback
+    def async_start_profile(self, cycles: int) -> None:
+        """Profile the next cycles coordinator updates."""
+        if self.profiler is not None:
+            raise HomeAssistantError("A profile is already running")
+        _LOGGER.info("Profiling the next %s update cycles", cycles)
+        self.profiler = CoordinatorProfiler(cycles, self.api)
+
+    @callback
+    def _async_finish_profile_cycle(self) -> None:
+        """Close the profiled cycle and write the results when complete."""
+        profiler = self.profiler
+        if profiler is None:
+            return
+
+        profiler.finish_cycle()
+        if not profiler.done:
+            return
+
+        self.profiler = None
+        entry_id = self.config_entry.entry_id if self.config_entry else DOMAIN
+        path_prefix = self.hass.config.path(
+            f"{DOMAIN}_profile_{entry_id}_{datetime.now():%Y%m%d-%H%M%S}"
+        )
+        self.hass.async_create_background_task(
+            self._async_write_profile(profiler, path_prefix), f"{DOMAIN} write profile"
+        )
+
+    async def _async_write_profile(self, profiler: CoordinatorProfiler, path_prefix: str) -> None:
+        """Write profile results to the config directory."""
+        paths = await self.hass.async_add_executor_job(profiler.write, path_prefix)
+        _LOGGER.info(
+            "Profile of %s cycles written to %s and %s",
+            profiler.cycles,
+            paths["stats"],
+            paths["summary"],
+        )
+
+    async def async_get_status(
+        self, device_ids: List[str], max_age: float, stale_while_revalidate: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return device statuses no older than max_age seconds.
+
+        Fresh devices are answered from the cache. Stale ones are queried in
+        one batch, or, with stale_while_revalidate, returned as they are while
+        the query runs in the background.
+        """
+        now = time.monotonic()
+        # Unknown devices are left out of the result rather than queried
+        stale = [
+            device_id
+            for device_id in device_ids
+            if device_id in (self.data or {})
+            and now - self.device_updated.get(device_id, float("-inf")) > max_age
+        ]
+
+        if stale and stale_while_revalidate:
+            pending = [device_id for device_id in stale if device_id not in self._revalidating]
+            if pending:
+                self._revalidating.update(pending)
+                self.hass.async_create_background_task(
+                    self._async_revalidate(pending, max_age), f"{DOMAIN} revalidate status"
+                )
+        elif stale:
+            try:
+                statuses = await self.hass.async_add_executor_job(
+                    self.api.query_devices, stale, max_age
+                )
+            except Exception as exception:
+                raise HomeAssistantError(
+                    f"Error querying device status: {exception}"
+                ) from exception
+            self.async_merge_device_status(statuses)
+
+        now = time.monotonic()
+        result = {}
+        for device_id in device_ids:
+            device = self.data.get(device_id)
+            if device is None:
+                continue
+            age = now - self.device_updated.get(device_id, now)
+            result[device_id] = {
+                "name": device.get("name"),
+                "status": device.get("status", {}),
+                "age": round(age, 3),
+                "stale": age > max_age,
+            }
+        return result
+
+    async def _async_revalidate(self, device_ids: List[str], max_age: float) -> None:
+        """Refresh the status of specific devices in the background."""
+        try:
+            statuses = await self.hass.async_add_executor_job(
+                self.api.query_devices, device_ids, max_age
             )
         except Exception as exception:
-            raise UpdateFailed(f"Error communicating with API: {exception}") from exception
\ No newline at end of file
+            _LOGGER.warning("Error revalidating device status: %s", exception)
+            return
+        finally:
+            self._revalidating.difference_update(device_ids)
+
+        self.async_merge_device_status(statuses)
+
+    @callback
+    def async_merge_device_status(self, statuses: Dict[str, Dict[str, Any]]) -> None:
+        """Merge freshly fetched statuses into the coordinator data."""
+        if not statuses or not self.data:
+            return
+
+        data = dict(self.data)
+        now = time.monotonic()
+        for device_id, status in statuses.items():
+            device = data.get(device_id)
+            if device is None:
+                continue
+            data[device_id] = {**device, "status": status}
+            self._async_fire_transitions(
+                device_id, device, data[device_id], SOURCE_QUERY, now
+            )
+            self.device_updated[device_id] = self.api.status_fetched.get(device_id, now)
+
+        self.reconciler.async_reconcile(data)
+        # async_set_updated_data would also push back the next scheduled
+        # poll, so targeted queries would starve every other lock of updates
+        self.data = data
+        self.async_update_listeners()
+
+    @callback
+    def _async_fire_transitions(
+        self,
+        device_id: str,
+        old_device: Dict[str, Any] | None,
+        new_device: Dict[str, Any],
+        source: str,
+        now: float,
+    ) -> None:
+        """Fire an event for each capability whose value changed."""
+        if old_device is None:
+            # First sighting of a device is not a transition
+            return
+        if old_device.get("status") is new_device.get("status"):
+            # Fingerprint matched, the status was not even decoded
+            return
+
+        old_values = _state_values(old_device)
+        new_values = _state_values(new_device)
+        if old_values == new_values:
+            return
+
+        # Latency is how long the change may have gone unseen: since the
+        # command that caused it, or since the previous observation.
+        observed_since = self.device_updated.get(device_id, now)
+        timing = None
+        if old_values.get(LOCK_CAPABILITY) != new_values.get(LOCK_CAPABILITY):
+            timing = self.command_latency.confirm(
+                device_id, new_values.get(LOCK_CAPABILITY), source, now
+            )
+
+        # A capability missing from either side changed to or from None
+        for capability in old_values.keys() | new_values.keys():
+            old_value = old_values.get(capability)
+            new_value = new_values.get(capability)
+            if old_value == new_value:
+                continue
+            confirmed = timing is not None and capability == LOCK_CAPABILITY
+            self.hass.bus.async_fire(
+                EVENT_LOCK_STATE_CHANGED,
+                {
+                    "device_id": device_id,
+                    "capability": capability,
+                    "old_value": old_value,
+                    "new_value": new_value,
+                    "source": SOURCE_COMMAND if confirmed else source,
+                    "latency": round(now - (timing.received if confirmed else observed_since), 3),
+                },
+            )
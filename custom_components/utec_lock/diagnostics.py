@@ -0,0 +1,39 @@
+"""Diagnostics support for Utec Lock integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN
+
+TO_REDACT = {CONF_CLIENT_ID, CONF_CLIENT_SECRET, "access_token", "refresh_token"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    fingerprint = coordinator.api.fingerprint_stats
+    responses = fingerprint["hits"] + fingerprint["misses"]
+
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "devices": coordinator.data,
+        "startup": entry_data["startup"],
+        "command_latency": coordinator.command_latency.as_dict(),
+        "pending_desired_state": coordinator.reconciler.pending,
+        "access_codes": {
+            "cached_per_lock": coordinator.access_codes.summary(),
+            "write_requests": coordinator.access_codes.write_requests,
+        },
+        "cache": coordinator.api.cache.as_dict(),
+        "fingerprint": {
+            **fingerprint,
+            "skip_ratio": round(fingerprint["hits"] / responses, 3) if responses else None,
+        },
+    }
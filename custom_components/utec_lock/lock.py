@@ -80,8 +80,8 @@ class UtecLock(LockEntity):
         }
         async with async_timeout.timeout(10):
             await token_session.post(API_URL, json=body)
-        # Optionally update state or rely on webhook/poll to refresh
-        self._is_locked = True
+        # Re-query instead of assuming the bolt moved
+        self.async_schedule_update_ha_state(True)
 
     async def async_unlock(self, **kwargs):
         """Unlock the device via Uhome.Device.Command."""
@@ -102,7 +102,8 @@ class UtecLock(LockEntity):
         }
         async with async_timeout.timeout(10):
             await token_session.post(API_URL, json=body)
-        self._is_locked = False
+        # Re-query instead of assuming the bolt moved
+        self.async_schedule_update_ha_state(True)
 
     @property
     def supported_features(self):
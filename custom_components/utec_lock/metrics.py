@@ -0,0 +1,143 @@
+"""Command latency tracking for Utec Lock integration."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .const import COMMAND_CONFIRM_WINDOW, COMMAND_LATENCY_SAMPLES
+
+# Phase name -> (start mark, end mark)
+PHASES = {
+    "executor": ("received", "sent"),
+    "http": ("sent", "acked"),
+    "confirm": ("acked", "confirmed"),
+    "total": ("received", "confirmed"),
+}
+
+# Command -> st.Lock value that confirms it
+CONFIRMING_STATE = {
+    "lock": "locked",
+    "unlock": "unlocked",
+}
+
+
+class CommandTiming:
+    """Timestamps of one command from service call to confirmed state."""
+
+    __slots__ = ("command", "received", "sent", "acked", "confirmed", "confirmed_by")
+
+    def __init__(self, command: str) -> None:
+        """Initialize."""
+        self.command = command
+        self.received = time.monotonic()
+        self.sent: Optional[float] = None
+        self.acked: Optional[float] = None
+        self.confirmed: Optional[float] = None
+        self.confirmed_by: Optional[str] = None
+
+    def phases(self) -> Dict[str, float]:
+        """Return the duration of each completed phase in seconds."""
+        durations = {}
+        for phase, (start, end) in PHASES.items():
+            started = getattr(self, start)
+            ended = getattr(self, end)
+            if started is not None and ended is not None:
+                durations[phase] = ended - started
+        return durations
+
+
+def _percentile(values: list, percent: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+class CommandLatencyTracker:
+    """Rolling per-device latency of lock commands."""
+
+    def __init__(self, samples: int = COMMAND_LATENCY_SAMPLES) -> None:
+        """Initialize."""
+        self._samples = samples
+        self._pending: Dict[str, CommandTiming] = {}
+        self._history: Dict[str, Deque[CommandTiming]] = {}
+
+    def start(self, device_id: str, command: str) -> CommandTiming:
+        """Start timing a command when the service call is received."""
+        timing = CommandTiming(command)
+        self._pending[device_id] = timing
+        return timing
+
+    def resume(self, device_id: str, command: str) -> CommandTiming:
+        """Return the pending timing of a retried command, or start a new one.
+
+        A retry keeps the original received time, so its sample covers the
+        whole wait rather than just the last attempt.
+        """
+        timing = self._pending.get(device_id)
+        if timing is None or timing.command != command:
+            return self.start(device_id, command)
+        return timing
+
+    def discard(self, device_id: str) -> None:
+        """Forget a pending command that was not accepted."""
+        self._pending.pop(device_id, None)
+
+    def confirm(
+        self, device_id: str, lock_state: Any, source: str, now: float
+    ) -> Optional[CommandTiming]:
+        """Complete the pending command of a device whose st.Lock changed.
+
+        Only the state the command asked for confirms it.
+        """
+        timing = self._pending.get(device_id)
+        if timing is None or timing.acked is None:
+            # Nothing sent, or the HTTP request has not returned yet
+            return None
+        if lock_state != CONFIRMING_STATE.get(timing.command):
+            return None
+
+        del self._pending[device_id]
+        if now - timing.received > COMMAND_CONFIRM_WINDOW:
+            return None
+
+        timing.confirmed = now
+        timing.confirmed_by = source
+        self._history.setdefault(device_id, deque(maxlen=self._samples)).append(timing)
+        return timing
+
+    def percentiles(self, device_id: str) -> Dict[str, Dict[str, float]]:
+        """Return p50/p95/max per phase for a device."""
+        history = self._history.get(device_id)
+        if not history:
+            return {}
+
+        result = {}
+        for phase in PHASES:
+            values = sorted(
+                durations[phase]
+                for durations in (timing.phases() for timing in history)
+                if phase in durations
+            )
+            if values:
+                result[phase] = {
+                    "p50": round(_percentile(values, 50), 3),
+                    "p95": round(_percentile(values, 95), 3),
+                    "max": round(values[-1], 3),
+                }
+        return result
+
+    def sample_count(self, device_id: str) -> int:
+        """Return the number of confirmed commands kept for a device."""
+        return len(self._history.get(device_id, ()))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return all statistics for diagnostics."""
+        return {
+            device_id: {
+                "samples": len(history),
+                "last_confirmed_by": history[-1].confirmed_by,
+                "phases": self.percentiles(device_id),
+            }
+            for device_id, history in self._history.items()
+        }
@@ -0,0 +1,183 @@
+"""On-demand profiling of coordinator cycles for Utec Lock integration."""
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions listed in the summary, by cumulative time
+SUMMARY_TOP_FUNCTIONS = 20
+# Only functions defined here are listed in the summary
+INTEGRATION_DIR = os.path.dirname(os.path.abspath(__file__))
+# From 3.12 cProfile is built on sys.monitoring and sees every thread
+PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class CoordinatorProfiler:
+    """Profile of the next few coordinator update cycles.
+
+    The executor-side fetch and the event loop work that follows it (delta
+    detection and entity updates) are profiled into one cProfile profile.
+    Each cycle also records wall time, the fetch's own wall time, time
+    waiting on HTTP responses, CPU time per side and JSON decode time.
+
+    On Python 3.12 and later the profile also captures every other thread
+    and the event loop while it is enabled, so the pstats file includes
+    unrelated work. The summary's top_functions is limited to this
+    integration's code, and profile_scope says which kind of file it is.
+    """
+
+    def __init__(self, cycles: int, api: Any) -> None:
+        """Initialize."""
+        self.cycles = cycles
+        self.profile = cProfile.Profile()
+        self.results: List[Dict[str, float]] = []
+        self._api = api
+        self._cycle: Optional[Dict[str, float]] = None
+
+    @property
+    def done(self) -> bool:
+        """Return True once all requested cycles were captured."""
+        return len(self.results) >= self.cycles
+
+    def start_cycle(self) -> None:
+        """Mark the start of a coordinator cycle."""
+        self._cycle = {
+            "started": time.perf_counter(),
+            "network_started": self._api.network_seconds,
+            "decode_started": self._api.fingerprint_stats["decode_seconds"],
+            "executor_cpu": 0.0,
+            "loop_cpu": 0.0,
+            "fetch_wall": 0.0,
+            "fetching": False,
+        }
+
+    def wrap(self, func: Callable[[], Any]) -> Callable[[], Any]:
+        """Profile func when it runs in the executor."""
+
+        def profiled() -> Any:
+            cycle = self._cycle
+            if cycle is not None:
+                cycle["fetching"] = True
+            wall_started = time.perf_counter()
+            started = time.thread_time()
+            enabled = self._enable()
+            try:
+                return func()
+            finally:
+                if enabled:
+                    self.profile.disable()
+                if cycle is not None:
+                    cycle["executor_cpu"] += time.thread_time() - started
+                    cycle["fetch_wall"] += time.perf_counter() - wall_started
+                    cycle["fetching"] = False
+
+        return profiled
+
+    @contextmanager
+    def section(self) -> Iterator[None]:
+        """Profile a block of event loop work that belongs to the cycle."""
+        if self._cycle is None:
+            yield
+            return
+
+        started = time.thread_time()
+        enabled = self._enable()
+        try:
+            yield
+        finally:
+            if enabled:
+                self.profile.disable()
+            self._cycle["loop_cpu"] += time.thread_time() - started
+
+    def finish_cycle(self) -> None:
+        """Record the summary of the current cycle.
+
+        Call once the cycle's data is committed and its listeners updated.
+        A cycle whose fetch is still running stays open.
+        """
+        cycle = self._cycle
+        if cycle is None:
+            return
+        if cycle["fetching"]:
+            _LOGGER.warning("Profiled cycle finished before its fetch returned, keeping it open")
+            return
+        self._cycle = None
+
+        wall = time.perf_counter() - cycle["started"]
+        network = self._api.network_seconds - cycle["network_started"]
+        cpu = cycle["executor_cpu"] + cycle["loop_cpu"]
+        self.results.append(
+            {
+                "wall": round(wall, 6),
+                "network_wait": round(network, 6),
+                "fetch_wall": round(cycle["fetch_wall"], 6),
+                "executor_cpu": round(cycle["executor_cpu"], 6),
+                "loop_cpu": round(cycle["loop_cpu"], 6),
+                "json_decode": round(
+                    self._api.fingerprint_stats["decode_seconds"] - cycle["decode_started"], 6
+                ),
+                "other_wait": round(max(0.0, wall - network - cpu), 6),
+            }
+        )
+
+    def write(self, path_prefix: str) -> Dict[str, str]:
+        """Write the pstats file and a JSON summary, return their paths."""
+        stats_path = f"{path_prefix}.pstats"
+        summary_path = f"{path_prefix}.json"
+        self.profile.dump_stats(stats_path)
+
+        stats = pstats.Stats(self.profile)
+        top = sorted(
+            (
+                item
+                for item in stats.stats.items()
+                if os.path.abspath(item[0][0]).startswith(INTEGRATION_DIR + os.sep)
+            ),
+            key=lambda item: item[1][3],
+            reverse=True,
+        )
+        totals = {
+            key: round(sum(result[key] for result in self.results), 6)
+            for key in self.results[0]
+        } if self.results else {}
+
+        summary = {
+            # What the pstats file covers; top_functions is always this integration only
+            "profile_scope": "all threads" if PROFILES_ALL_THREADS else "coordinator cycles",
+            "top_functions_scope": "integration",
+            "cycles": self.results,
+            "totals": totals,
+            "top_functions": [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "own_seconds": round(own, 6),
+                    "cumulative_seconds": round(cumulative, 6),
+                }
+                for (filename, line, name), (_, calls, own, cumulative, _) in top[
+                    :SUMMARY_TOP_FUNCTIONS
+                ]
+            ],
+        }
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+        return {"stats": stats_path, "summary": summary_path}
+
+    def _enable(self) -> bool:
+        """Enable the profile, unless another profiler is already active."""
+        try:
+            self.profile.enable()
+        except ValueError as err:
+            _LOGGER.debug("Profiling skipped for this section: %s", err)
+            return False
+        return True
@@ -0,0 +1,156 @@
+"""Desired-state reconciliation for Utec Lock integration."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    EVENT_LOCK_STUCK,
+    RECONCILE_GRACE,
+    RECONCILE_MAX_RETRIES,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import UtecLockDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+LOCKED = "locked"
+UNLOCKED = "unlocked"
+
+
+class DesiredState:
+    """Target lock state of one device and its retry bookkeeping."""
+
+    __slots__ = ("value", "retries", "next_attempt")
+
+    def __init__(self, value: str) -> None:
+        """Initialize."""
+        self.value = value
+        self.retries = 0
+        # Give the first command time to reach the lock before retrying
+        self.next_attempt = time.monotonic() + RECONCILE_GRACE
+
+
+class LockReconciler:
+    """Re-issue lock commands until reported state matches the desired state.
+
+    Only lock commands are retried. A lock that auto-locks can relock
+    before any poll sees it unlocked, so retrying an unlock could open
+    the door again. An unlock that is not seen within the grace period
+    is dropped.
+
+    Only devices with a pending desired state are looked at, so a fleet
+    with nothing pending costs one dict check per update.
+    """
+
+    def __init__(self, coordinator: UtecLockDataUpdateCoordinator) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self._desired: Dict[str, DesiredState] = {}
+        self._unsub_check: Callable[[], None] | None = None
+
+    @property
+    def pending(self) -> Dict[str, str]:
+        """Return device_id -> desired value of all pending devices."""
+        return {device_id: desired.value for device_id, desired in self._desired.items()}
+
+    @callback
+    def async_set_desired(self, device_id: str, locked: bool) -> None:
+        """Record the state a device should end up in."""
+        self._desired[device_id] = DesiredState(LOCKED if locked else UNLOCKED)
+        self._async_schedule_check()
+
+    @callback
+    def async_reconcile(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Compare pending devices with freshly reported data."""
+        if not self._desired:
+            return
+
+        now = time.monotonic()
+        for device_id, desired in list(self._desired.items()):
+            reported = self._coordinator.reported_lock_state(data.get(device_id))
+            if reported == desired.value:
+                del self._desired[device_id]
+                continue
+            if now < desired.next_attempt:
+                continue
+
+            if desired.value == UNLOCKED:
+                del self._desired[device_id]
+                _LOGGER.debug(
+                    "Lock %s reports %s after unlock, not retrying", device_id, reported
+                )
+                continue
+
+            if desired.retries >= RECONCILE_MAX_RETRIES:
+                del self._desired[device_id]
+                _LOGGER.warning(
+                    "Lock %s stuck %s, wanted %s after %s retries",
+                    device_id,
+                    reported,
+                    desired.value,
+                    desired.retries,
+                )
+                self._coordinator.hass.bus.async_fire(
+                    EVENT_LOCK_STUCK,
+                    {
+                        "device_id": device_id,
+                        "desired": desired.value,
+                        "reported": reported,
+                        "retries": desired.retries,
+                    },
+                )
+                continue
+
+            desired.retries += 1
+            desired.next_attempt = now + RECONCILE_GRACE * 2**desired.retries
+            _LOGGER.debug(
+                "Lock %s reports %s, re-sending %s (retry %s)",
+                device_id,
+                reported,
+                desired.value,
+                desired.retries,
+            )
+            self._coordinator.hass.async_create_background_task(
+                self._coordinator.async_send_command(device_id, "lock", retry=True),
+                f"{DOMAIN} reconcile {device_id}",
+            )
+
+        self._async_schedule_check()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending check."""
+        if self._unsub_check:
+            self._unsub_check()
+            self._unsub_check = None
+
+    @callback
+    def _async_schedule_check(self, minimum: float = 0) -> None:
+        """Query pending devices once the earliest retry is due."""
+        self.async_shutdown()
+        if not self._desired:
+            return
+
+        delay = min(desired.next_attempt for desired in self._desired.values()) - time.monotonic()
+        self._unsub_check = async_call_later(
+            self._coordinator.hass, max(delay, minimum), self._async_check
+        )
+
+    async def _async_check(self, _now: Any) -> None:
+        """Fetch the state of pending devices, which reconciles them."""
+        self._unsub_check = None
+        device_ids = list(self._desired)
+        try:
+            # max_age=0 forces a query; the merge calls async_reconcile
+            await self._coordinator.async_get_status(device_ids, 0)
+        except HomeAssistantError as err:
+            _LOGGER.warning("Error checking pending locks: %s", err)
+            self._async_schedule_check(RECONCILE_GRACE)
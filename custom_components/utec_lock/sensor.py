@@ -5,7 +5,13 @@ import logging
 from typing import Any
 
 from homeassistant.components.lock import LockEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -31,14 +37,29 @@ async def async_setup_entry(
         hass.data[DOMAIN] = {}
     hass.data[DOMAIN]["session"] = api.session
     
-    # Add locks
-    locks = []
+    # Add locks and their command latency sensors
+    entities = []
     for device_id, device in coordinator.data.items():
         # Check if the device is a lock
         if device.get("type") == "lock":
-            locks.append(UtecLockCoordinator(coordinator, device_id, device))
+            entities.append(UtecLockCoordinator(coordinator, device_id, device))
+            for percentile in ("p50", "p95"):
+                entities.append(
+                    UtecCommandLatencySensor(coordinator, device_id, device, percentile)
+                )
 
-    async_add_entities(locks)
+    async_add_entities(entities)
+
+
+def _device_info(device_id: str, device: dict[str, Any]) -> DeviceInfo:
+    """Return device info for a Utec device."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, device_id)},
+        name=device.get("name", f"Utec Lock {device_id}"),
+        manufacturer="U-tec",
+        model=device.get("model", "Ultraloq"),
+        sw_version=device.get("firmware_version", "Unknown"),
+    )
 
 
 class UtecLockCoordinator(CoordinatorEntity, LockEntity):
@@ -51,13 +72,7 @@ class UtecLockCoordinator(CoordinatorEntity, LockEntity):
         self._name = device.get("name", f"Utec Lock {device_id}")
         
         # Set device info
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            name=self._name,
-            manufacturer="U-tec",
-            model=device.get("model", "Ultraloq"),
-            sw_version=device.get("firmware_version", "Unknown"),
-        )
+        self._attr_device_info = _device_info(device_id, device)
         self._attr_unique_id = f"{DOMAIN}_{device_id}"
 
     @property
@@ -89,16 +104,51 @@ class UtecLockCoordinator(CoordinatorEntity, LockEntity):
 
     async def async_lock(self, **kwargs):
         """Lock the device."""
-        api = self.coordinator.api
-        result = await self.hass.async_add_executor_job(api.lock, self._device_id)
-        if result:
-            # Trigger a refresh of the coordinator
-            await self.coordinator.async_request_refresh()
+        await self._async_send_command("lock", True)
 
     async def async_unlock(self, **kwargs):
         """Unlock the device."""
-        api = self.coordinator.api
-        result = await self.hass.async_add_executor_job(api.unlock, self._device_id)
-        if result:
+        await self._async_send_command("unlock", False)
+
+    async def _async_send_command(self, command: str, locked: bool) -> None:
+        """Send a command and keep reconciling until the lock reports it."""
+        self.coordinator.reconciler.async_set_desired(self._device_id, locked)
+        if await self.coordinator.async_send_command(self._device_id, command):
             # Trigger a refresh of the coordinator
-            await self.coordinator.async_request_refresh()
\ No newline at end of file
+            await self.coordinator.async_request_refresh()
+
+
+class UtecCommandLatencySensor(CoordinatorEntity, SensorEntity):
+    """End-to-end command latency of a Utec Lock."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, device_id, device, percentile):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._percentile = percentile
+        name = device.get("name", f"Utec Lock {device_id}")
+        self._attr_name = f"{name} command latency {percentile}"
+        self._attr_device_info = _device_info(device_id, device)
+        self._attr_unique_id = f"{DOMAIN}_{device_id}_command_latency_{percentile}"
+
+    @property
+    def native_value(self):
+        """Return the total latency percentile in seconds."""
+        total = self.coordinator.command_latency.percentiles(self._device_id).get("total")
+        if not total:
+            return None
+        return total[self._percentile]
+
+    @property
+    def extra_state_attributes(self):
+        """Return the per-phase latency percentiles."""
+        tracker = self.coordinator.command_latency
+        attributes = {"samples": tracker.sample_count(self._device_id)}
+        for phase, values in tracker.percentiles(self._device_id).items():
+            attributes[phase] = values[self._percentile]
+        return attributes
\ No newline at end of file
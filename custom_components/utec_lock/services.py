@@ -0,0 +1,167 @@
+"""Services for the Utec Lock integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CODE,
+    ATTR_CODES,
+    ATTR_CYCLES,
+    ATTR_DEVICE_ID,
+    ATTR_MAX_AGE,
+    ATTR_NAME,
+    ATTR_REFRESH,
+    ATTR_REMOVE_UNLISTED,
+    ATTR_STALE_WHILE_REVALIDATE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SERVICE_GET_STATUS,
+    SERVICE_PROFILE,
+    SERVICE_SYNC_ACCESS_CODES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+GET_STATUS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_AGE, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_STALE_WHILE_REVALIDATE, default=False): cv.boolean,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+SYNC_ACCESS_CODES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_CODES): [
+            vol.Schema(
+                {
+                    vol.Required(ATTR_NAME): cv.string,
+                    vol.Required(ATTR_CODE): vol.All(cv.string, vol.Match(r"^\d{4,8}$")),
+                }
+            )
+        ],
+        vol.Optional(ATTR_REMOVE_UNLISTED, default=False): cv.boolean,
+        vol.Optional(ATTR_REFRESH, default=False): cv.boolean,
+    }
+)
+
+
+def _async_coordinators(hass: HomeAssistant) -> list:
+    """Return the coordinators of all loaded config entries."""
+    return [
+        entry_data["coordinator"]
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        if isinstance(entry_data, dict) and "coordinator" in entry_data
+    ]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Utec Lock services."""
+
+    async def async_get_status(call: ServiceCall) -> ServiceResponse:
+        """Return lock statuses, refreshing only those older than max_age."""
+        device_ids = call.data[ATTR_DEVICE_ID]
+
+        lookups = []
+        for coordinator in _async_coordinators(hass):
+            owned = [device_id for device_id in device_ids if device_id in (coordinator.data or {})]
+            if owned:
+                lookups.append(
+                    coordinator.async_get_status(
+                        owned,
+                        call.data[ATTR_MAX_AGE],
+                        call.data[ATTR_STALE_WHILE_REVALIDATE],
+                    )
+                )
+
+        devices = {}
+        for result in await asyncio.gather(*lookups):
+            devices.update(result)
+
+        if unknown := [device_id for device_id in device_ids if device_id not in devices]:
+            raise HomeAssistantError(f"Unknown Utec device: {', '.join(unknown)}")
+
+        return {"devices": devices}
+
+    async def async_sync_access_codes(call: ServiceCall) -> ServiceResponse:
+        """Bring the access codes of a group of locks to the desired set."""
+        device_ids = call.data[ATTR_DEVICE_ID]
+        desired = {code[ATTR_NAME]: code[ATTR_CODE] for code in call.data[ATTR_CODES]}
+
+        coordinators = _async_coordinators(hass)
+        known = {
+            device_id for coordinator in coordinators for device_id in (coordinator.data or {})
+        }
+        if unknown := [device_id for device_id in device_ids if device_id not in known]:
+            raise HomeAssistantError(f"Unknown Utec device: {', '.join(unknown)}")
+
+        syncs = []
+        for coordinator in coordinators:
+            owned = [device_id for device_id in device_ids if device_id in (coordinator.data or {})]
+            if owned:
+                syncs.append(
+                    coordinator.access_codes.async_sync(
+                        owned,
+                        desired,
+                        call.data[ATTR_REMOVE_UNLISTED],
+                        call.data[ATTR_REFRESH],
+                    )
+                )
+
+        try:
+            results = await asyncio.gather(*syncs)
+        except Exception as err:
+            raise HomeAssistantError(f"Error fetching access codes: {err}") from err
+
+        devices = {}
+        for result in results:
+            devices.update(result)
+        return {"devices": devices}
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next coordinator cycles of every account."""
+        coordinators = _async_coordinators(hass)
+        if not coordinators:
+            raise HomeAssistantError("No Utec accounts are loaded")
+        if any(coordinator.profiler is not None for coordinator in coordinators):
+            # Starting over would throw away the cycles captured so far
+            raise HomeAssistantError("A profile is already running")
+
+        for coordinator in coordinators:
+            coordinator.async_start_profile(call.data[ATTR_CYCLES])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATUS,
+        async_get_status,
+        schema=GET_STATUS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SYNC_ACCESS_CODES,
+        async_sync_access_codes,
+        schema=SYNC_ACCESS_CODES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
@@ -0,0 +1,172 @@
+"""Traffic recording and replay transports for Utec Lock integration."""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import parse_qsl
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+# Credentials, plus the PINs carried by st.lockUser requests and responses
+REDACT_FIELDS = {"access_token", "refresh_token", "client_id", "client_secret", "code", "password"}
+# Response headers worth keeping in a capture
+RECORD_HEADERS = ("Content-Type", "ETag")
+
+
+def _redact(value: Any) -> Any:
+    """Replace credentials anywhere in a decoded body."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in REDACT_FIELDS else _redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _decode_request(request: PreparedRequest) -> Any:
+    """Return a redacted, decoded request body."""
+    body = request.body
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    if "json" in request.headers.get("Content-Type", ""):
+        return _redact(json.loads(body))
+    return _redact(dict(parse_qsl(body)))
+
+
+def _request_key(method: str, url: str, body: Any) -> str:
+    """Identify a request regardless of its messageId."""
+    if isinstance(body, dict) and "header" in body:
+        header = body["header"]
+        body = {
+            "action": f"{header.get('namespace')}.{header.get('name')}",
+            "payload": body.get("payload"),
+        }
+    return f"{method} {url} {json.dumps(body, sort_keys=True)}"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport that records redacted request/response pairs as JSON lines."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the adapter."""
+        super().__init__()
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        """Send the request and append it to the capture."""
+        started = time.monotonic()
+        response = super().send(request, **kwargs)
+        # Reading the body here keeps stream=True callers working from memory
+        content = response.content
+        elapsed = time.monotonic() - started
+
+        try:
+            body: Any = _redact(json.loads(content))
+        except ValueError:
+            body = content.decode("utf-8", "replace")
+
+        record = {
+            "t": round(started - self._started, 6),
+            "elapsed": round(elapsed, 6),
+            "method": request.method,
+            "url": request.url,
+            "request": _decode_request(request),
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORD_HEADERS
+                if name in response.headers
+            },
+            "body": body,
+        }
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return response
+
+    def close(self) -> None:
+        """Close the capture file and the connection pool."""
+        super().close()
+        self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport that serves responses from a capture instead of the network.
+
+    Requests are matched on method, URL, action and payload. Repeated
+    requests are answered in recorded order; once a request's recordings
+    run out, the last one is served again so replays can run for any
+    number of cycles.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0) -> None:
+        """Initialize the adapter.
+
+        speed scales the recorded response times; 1.0 replays at original
+        speed, larger values replay faster and 0 or None without delay.
+        """
+        super().__init__()
+        self._speed = speed
+        self._lock = threading.Lock()
+        self._records: Dict[str, Deque[Dict[str, Any]]] = {}
+
+        with open(path, encoding="utf-8") as capture:
+            for line in capture:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = _request_key(record["method"], record["url"], record["request"])
+                self._records.setdefault(key, deque()).append(record)
+
+        _LOGGER.debug("Loaded %s recorded requests from %s", len(self._records), path)
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        """Return the recorded response for the request."""
+        request_body = _decode_request(request)
+        key = _request_key(request.method, request.url, request_body)
+        with self._lock:
+            queue = self._records.get(key)
+            if not queue:
+                raise RequestsConnectionError(f"No recorded response for {key}", request=request)
+            record = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if self._speed:
+            time.sleep(record["elapsed"] / self._speed)
+
+        body = record["body"]
+        if not isinstance(body, str):
+            if isinstance(body, dict) and "header" in body and isinstance(request_body, dict):
+                # Echo the live messageId like the API does
+                message_id = request_body.get("header", {}).get("messageId")
+                body = {**body, "header": {**body["header"], "messageId": message_id}}
+            body = json.dumps(body)
+
+        response = Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = body.encode("utf-8")
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=record["elapsed"])
+        return response
+
+    def close(self) -> None:
+        """Nothing to release."""
@@ -0,0 +1,23 @@
+"""
+Import the Utec Lock integration's modules without Home Assistant.
+Used by the benchmark and command-line scripts in this directory. Only
+modules that do not import homeassistant, such as api and const, can be
+loaded this way.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+INTEGRATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "custom_components", "utec_lock")
+
+
+def import_integration_module(name):
+    """Import utec_lock.<name>, registering a bare utec_lock package first."""
+    if "utec_lock" not in sys.modules:
+        spec = importlib.util.spec_from_loader("utec_lock", loader=None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [INTEGRATION_DIR]
+        sys.modules["utec_lock"] = package
+    return importlib.import_module(f"utec_lock.{name}")
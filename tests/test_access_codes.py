@@ -0,0 +1,115 @@
+"""Tests for access code syncing."""
+import asyncio
+
+import pytest
+
+from integration_loader import import_integration_module
+
+access_codes = import_integration_module("access_codes")
+const = import_integration_module("const")
+
+
+class FakeHass:
+    """The part of HomeAssistant that AccessCodeManager uses."""
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+class FakeApi:
+    """Access code endpoints answering from fixed data."""
+
+    def __init__(self, users, responses=None):
+        self.users = users
+        self.responses = responses
+        self.fetches = 0
+        self.writes = []
+
+    def get_access_codes(self, device_ids):
+        self.fetches += 1
+        return {device_id: self.users[device_id] for device_id in device_ids if device_id in self.users}
+
+    def send_access_code_commands(self, commands):
+        self.writes.append(commands)
+        if self.responses is not None:
+            return self.responses(commands)
+        return {device_id: {"id": device_id, "user": {"id": 99}} for device_id, _, _ in commands}
+
+
+@pytest.fixture(autouse=True)
+def no_write_interval(monkeypatch):
+    """Do not wait between write requests."""
+    monkeypatch.setattr(access_codes, "ACCESS_CODE_WRITE_INTERVAL", 0)
+
+
+def sync(manager, device_ids, desired, **kwargs):
+    """Run one sync to completion."""
+    return asyncio.run(manager.async_sync(device_ids, desired, **kwargs))
+
+
+def test_compute_diff_orders_removals_updates_additions():
+    """Removals come first to free slots, then updates, then additions."""
+    current = {
+        "Owner": {"id": 1, "code": "1111"},
+        "Old cleaner": {"id": 2, "code": "2222"},
+    }
+    desired = {"New guest": "4444", "Owner": "1234"}
+
+    assert access_codes.compute_diff(current, desired, True) == [
+        (const.ACCESS_CODE_DELETE, {"id": 2}),
+        (const.ACCESS_CODE_UPDATE, {"id": 1, "name": "Owner", "password": "1234"}),
+        (const.ACCESS_CODE_ADD, {"name": "New guest", "password": "4444"}),
+    ]
+
+
+def test_compute_diff_keeps_unlisted_codes_by_default():
+    """Without remove_unlisted, codes missing from the list stay."""
+    current = {"Owner": {"id": 1, "code": "1111"}}
+    assert access_codes.compute_diff(current, {"Owner": "1111"}, False) == []
+
+
+def test_unchanged_sync_sends_no_writes():
+    """A second identical sync is answered from the cached codes."""
+    api = FakeApi({"lock": [{"id": 1, "name": "Owner", "password": "1111"}]})
+    manager = access_codes.AccessCodeManager(FakeHass(), api)
+
+    sync(manager, ["lock"], {"Owner": "1111", "Guest": "2222"})
+    result = sync(manager, ["lock"], {"Owner": "1111", "Guest": "2222"})
+
+    assert api.fetches == 1
+    assert len(api.writes) == 1
+    assert result["lock"] == {"added": 0, "updated": 0, "removed": 0, "failed": 0}
+
+
+@pytest.mark.parametrize("entry", [None, {"id": "lock", "error": {"code": "DEVICE_OFFLINE"}}])
+def test_failed_or_missing_entry_skips_lock_and_drops_cache(entry):
+    """A lock with an error entry, or none at all, is not treated as updated."""
+
+    def responses(commands):
+        return {} if entry is None else {device_id: entry for device_id, _, _ in commands}
+
+    api = FakeApi({"lock": []}, responses)
+    manager = access_codes.AccessCodeManager(FakeHass(), api)
+
+    result = sync(manager, ["lock"], {"Guest": "2222", "Cleaner": "3333"})
+
+    # The first failure skips the lock's second addition
+    assert len(api.writes) == 1
+    assert result["lock"] == {"added": 0, "updated": 0, "removed": 0, "failed": 1}
+    assert manager.summary() == {}
+
+    sync(manager, ["lock"], {"Guest": "2222", "Cleaner": "3333"})
+    assert api.fetches == 2
+
+
+def test_refresh_refetches_cached_codes():
+    """refresh picks up codes changed outside Home Assistant."""
+    api = FakeApi({"lock": [{"id": 1, "name": "Owner", "password": "1111"}]})
+    manager = access_codes.AccessCodeManager(FakeHass(), api)
+
+    sync(manager, ["lock"], {"Owner": "1111"})
+    api.users["lock"] = [{"id": 1, "name": "Owner", "password": "9999"}]
+    result = sync(manager, ["lock"], {"Owner": "1111"}, refresh=True)
+
+    assert api.fetches == 2
+    assert result["lock"]["updated"] == 1
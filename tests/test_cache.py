@@ -0,0 +1,81 @@
+"""Tests for the API response cache."""
+import pytest
+
+from integration_loader import import_integration_module
+
+cache_module = import_integration_module("cache")
+
+
+class Clock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the cache's clock."""
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def make_cache():
+    """Return a cache with a long-lived and a short-lived kind."""
+    return cache_module.ResponseCache(
+        {"devices": 600, "status": 10}, {"devices": 2, "status": 3}
+    )
+
+
+def test_entries_expire_after_their_kind_ttl(clock):
+    """Each kind expires on its own TTL."""
+    cache = make_cache()
+    cache.set("devices", None, ["d1"])
+    cache.set("status", "d1", {"online": True})
+
+    clock.now += 11
+    assert cache.get("status", "d1") is None
+    assert cache.get("devices", None) == ["d1"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_max_age_only_tightens_ttl(clock):
+    """max_age below the TTL misses, above it cannot extend the TTL."""
+    cache = make_cache()
+    cache.set("status", "d1", {"online": True})
+
+    clock.now += 5
+    assert cache.get("status", "d1", max_age=2) is None
+    assert cache.lookup("status", "d1", max_age=6) == (1000.0, {"online": True})
+    clock.now += 6
+    assert cache.get("status", "d1", max_age=60) is None
+
+
+def test_caps_are_per_kind_and_evict_least_recently_used(clock):
+    """Filling one kind never evicts the other."""
+    cache = make_cache()
+    cache.set("devices", None, ["d1"])
+    for device_id in ("d1", "d2", "d3"):
+        cache.set("status", device_id, {})
+    cache.get("status", "d1")
+    cache.set("status", "d4", {})
+
+    assert cache.get("status", "d2") is None
+    assert cache.get("status", "d1") == {}
+    assert cache.get("devices", None) == ["d1"]
+    assert cache.evictions == 1
+    assert cache.as_dict()["entries"] == {"devices": 1, "status": 3}
+
+
+def test_invalidate_counts_dropped_entries(clock):
+    """Only entries that existed count as invalidated."""
+    cache = make_cache()
+    cache.set("status", "d1", {})
+    cache.invalidate("status", ["d1", "unknown"])
+
+    assert cache.get("status", "d1") is None
+    assert cache.invalidations == 1
@@ -0,0 +1,50 @@
+"""Tests for the incremental JSON array decoder."""
+import json
+
+import pytest
+
+from integration_loader import import_integration_module
+
+iter_json_array = import_integration_module("api").iter_json_array
+
+
+def chunked(text, size):
+    """Split text into UTF-8 chunks of size bytes."""
+    data = text.encode()
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+def test_elements_split_across_chunks(size):
+    """Every chunk boundary yields the same elements as a full decode."""
+    devices = [
+        {"id": "d1", "name": "Front Door é☃", "battery": 87},
+        {"id": "d2", "name": "Back, Door ]", "states": [1, 22, 333]},
+    ]
+    body = json.dumps({"header": {"name": "List"}, "payload": {"devices": devices}})
+    assert list(iter_json_array(chunked(body, size), "devices")) == devices
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 4096])
+def test_scalars_split_across_chunks(size):
+    """Numbers cut by a chunk boundary are not yielded early."""
+    values = [1, 22, 333, -4.5e10, True, None, "x"]
+    body = json.dumps({"devices": values})
+    assert list(iter_json_array(chunked(body, size), "devices")) == values
+
+
+def test_key_as_string_value_is_skipped():
+    """The key text appearing as a value does not start the array."""
+    body = '{"note": "devices", "devices": [{"id": "d1"}]}'
+    assert list(iter_json_array(chunked(body, 1), "devices")) == [{"id": "d1"}]
+
+
+def test_missing_key_yields_nothing():
+    """A body without the key yields no elements."""
+    assert list(iter_json_array(chunked('{"payload": {}}', 3), "devices")) == []
+
+
+def test_truncated_array_raises():
+    """A stream that ends inside the array is an error."""
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked('{"devices": [{"id": "d1"}, 12', 4), "devices"))
@@ -0,0 +1,56 @@
+"""Tests for command latency tracking."""
+from integration_loader import import_integration_module
+
+metrics = import_integration_module("metrics")
+const = import_integration_module("const")
+
+
+def acked_command(tracker, command, at=100.0):
+    """Start a command whose HTTP request has returned."""
+    timing = tracker.start("lock", command)
+    timing.received = timing.sent = timing.acked = at
+    return timing
+
+
+def test_only_target_state_confirms():
+    """A lock is confirmed by "locked" only, an unlock by "unlocked" only."""
+    tracker = metrics.CommandLatencyTracker()
+    timing = acked_command(tracker, "lock")
+
+    assert tracker.confirm("lock", "unlocked", "poll", 101.0) is None
+    assert tracker.confirm("lock", None, "poll", 102.0) is None
+    assert tracker.confirm("lock", "locked", "poll", 103.0) is timing
+    assert timing.phases()["total"] == 3.0
+    assert tracker.sample_count("lock") == 1
+
+    acked_command(tracker, "unlock")
+    assert tracker.confirm("lock", "locked", "poll", 101.0) is None
+    assert tracker.confirm("lock", "unlocked", "query", 101.0) is not None
+
+
+def test_unacked_command_is_not_confirmed():
+    """A state change before the HTTP request returned is not the command's."""
+    tracker = metrics.CommandLatencyTracker()
+    tracker.start("lock", "lock")
+
+    assert tracker.confirm("lock", "locked", "poll", 101.0) is None
+
+
+def test_confirmation_outside_window_is_dropped():
+    """A late confirmation ends the command without recording a sample."""
+    tracker = metrics.CommandLatencyTracker()
+    acked_command(tracker, "lock")
+    late = 100.0 + const.COMMAND_CONFIRM_WINDOW + 1
+
+    assert tracker.confirm("lock", "locked", "poll", late) is None
+    assert tracker.sample_count("lock") == 0
+    assert tracker.confirm("lock", "locked", "poll", late + 1) is None
+
+
+def test_resume_keeps_original_timing():
+    """A retry of the same command continues the pending timing."""
+    tracker = metrics.CommandLatencyTracker()
+    timing = acked_command(tracker, "lock")
+
+    assert tracker.resume("lock", "lock") is timing
+    assert tracker.resume("lock", "unlock") is not timing
@@ -0,0 +1,53 @@
+"""Tests for coordinator cycle profiling."""
+import asyncio
+import time
+
+from integration_loader import import_integration_module
+
+CoordinatorProfiler = import_integration_module("profiler").CoordinatorProfiler
+
+
+class FakeApi:
+    """Counters the profiler reads from UtecLockApi."""
+
+    network_seconds = 0.0
+    fingerprint_stats = {"decode_seconds": 0.0}
+
+
+def test_cycle_wall_time_covers_fetch():
+    """A cycle closed after the refresh covers the executor fetch."""
+    profiler = CoordinatorProfiler(1, FakeApi())
+
+    async def refresh():
+        profiler.start_cycle()
+        fetch = profiler.wrap(lambda: time.sleep(0.2))
+        await asyncio.get_running_loop().run_in_executor(None, fetch)
+        with profiler.section():
+            sum(range(1000))
+        profiler.finish_cycle()
+
+    asyncio.run(refresh())
+
+    assert profiler.done
+    cycle = profiler.results[0]
+    assert cycle["fetch_wall"] >= 0.2
+    assert cycle["wall"] >= cycle["fetch_wall"]
+
+
+def test_cycle_stays_open_while_fetch_runs():
+    """Finishing a cycle whose fetch is still running records nothing."""
+    profiler = CoordinatorProfiler(1, FakeApi())
+
+    async def refresh():
+        profiler.start_cycle()
+        fetch = profiler.wrap(lambda: time.sleep(0.2))
+        future = asyncio.get_running_loop().run_in_executor(None, fetch)
+        await asyncio.sleep(0.05)
+        profiler.finish_cycle()
+        assert not profiler.results
+        await future
+        profiler.finish_cycle()
+
+    asyncio.run(refresh())
+
+    assert profiler.results[0]["wall"] >= profiler.results[0]["fetch_wall"] >= 0.2
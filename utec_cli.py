@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Fleet command-line client for the Utec API.
+Lists devices, queries status and runs bulk lock/unlock across one or more
+accounts, reusing the integration's UtecLockApi outside Home Assistant.
+
+Profiles are read from an INI file, one section per account:
+
+    [site-a]
+    client_id = ...
+    client_secret = ...
+    refresh_token = ...
+
+Tokens are cached between runs so each run does not re-authenticate.
+"""
+
+import argparse
+import asyncio
+import configparser
+import csv
+import json
+import logging
+import os
+import sys
+import time
+import urllib.parse
+import uuid
+
+from integration_loader import import_integration_module
+
+DEFAULT_CONFIG = os.path.expanduser("~/.config/utec/profiles.ini")
+DEFAULT_TOKEN_CACHE = os.path.expanduser("~/.cache/utec/tokens.json")
+
+OAUTH_AUTHORIZE_URL = "https://oauth.u-tec.com/authorize"
+OAUTH_TOKEN_URL = "https://oauth.u-tec.com/token"
+
+FIELDS = {
+    "list": ["profile", "device_id", "name", "type", "model", "elapsed_ms"],
+    "status": ["profile", "device_id", "online", "lock_state", "ok", "error", "elapsed_ms"],
+    "lock": ["profile", "device_id", "command", "ok", "error", "elapsed_ms"],
+    "unlock": ["profile", "device_id", "command", "ok", "error", "elapsed_ms"],
+}
+
+logger = logging.getLogger("utec_cli")
+
+
+class TokenCache:
+    """Tokens per profile, persisted to a user-only JSON file."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as cache:
+                self.tokens = json.load(cache)
+        except (OSError, ValueError):
+            self.tokens = {}
+
+    def get(self, profile):
+        return self.tokens.get(profile, {})
+
+    def update(self, profile, api):
+        self.tokens[profile] = {
+            "access_token": api.access_token,
+            "refresh_token": api.refresh_token,
+            "expires_at": api.token_expires_at,
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as cache:
+            json.dump(self.tokens, cache, indent=2)
+
+
+class Output:
+    """Writes result rows as JSON lines or CSV as soon as they are ready."""
+
+    def __init__(self, fmt, fields, stream=sys.stdout):
+        self._stream = stream
+        self._writer = None
+        self.failures = 0
+        if fmt == "csv":
+            self._writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore")
+            self._writer.writeheader()
+
+    def write(self, row):
+        if row.get("ok") is False:
+            self.failures += 1
+        if self._writer:
+            self._writer.writerow(row)
+        else:
+            self._stream.write(json.dumps(row) + "\n")
+        self._stream.flush()
+
+
+class Timings:
+    """Request latencies per profile for the closing summary."""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, profile, seconds):
+        self.samples.setdefault(profile, []).append(seconds)
+
+    def summary(self):
+        lines = []
+        for profile, samples in self.samples.items():
+            samples = sorted(samples)
+            p50 = samples[len(samples) // 2]
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            lines.append(
+                f"{profile}: {len(samples)} requests, "
+                f"p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, max {samples[-1] * 1000:.0f} ms"
+            )
+        return lines
+
+
+def lock_state(status):
+    """Return the st.Lock value from a status payload."""
+    for state in status.get("states", []):
+        if state.get("capability") == "st.Lock":
+            return state.get("value")
+    return None
+
+
+async def timed(semaphore, timings, profile, func, *args):
+    """Run a blocking API call in a thread, bounded by the semaphore."""
+    async with semaphore:
+        started = time.monotonic()
+        try:
+            return await asyncio.to_thread(func, *args), None, time.monotonic() - started
+        except Exception as e:
+            return None, str(e), time.monotonic() - started
+        finally:
+            timings.add(profile, time.monotonic() - started)
+
+
+def make_api(api_module, args, profile, settings, token_cache):
+    """Create and authenticate an API client for a profile."""
+    cached = token_cache.get(profile)
+    api = api_module.UtecLockApi(
+        client_id=settings.get("client_id"),
+        client_secret=settings.get("client_secret"),
+        access_token=cached.get("access_token") or settings.get("access_token"),
+        refresh_token=cached.get("refresh_token") or settings.get("refresh_token"),
+        token_expires_at=cached.get("expires_at"),
+    )
+    if args.record:
+        api.record_traffic(f"{args.record}.{profile}.jsonl" if len(args.profile) > 1 else args.record)
+    elif args.replay:
+        api.replay_traffic(args.replay, args.replay_speed)
+
+    if api.has_fresh_token():
+        return api
+    if not api.authenticate():
+        raise RuntimeError(f"Authentication failed for profile {profile}")
+    token_cache.update(profile, api)
+    return api
+
+
+async def run_profile(api_module, args, profile, settings, token_cache, output, timings):
+    """Run the selected command against one account, return the device IDs it handled."""
+    started = time.monotonic()
+    api = await asyncio.to_thread(make_api, api_module, args, profile, settings, token_cache)
+    logger.info("%s: authenticated in %.0f ms", profile, (time.monotonic() - started) * 1000)
+    try:
+        return await run_command(api, args, profile, output, timings)
+    finally:
+        # Requests may have refreshed, and rotated, the tokens during the run
+        token_cache.update(profile, api)
+
+
+async def run_command(api, args, profile, output, timings):
+    """Run the selected command with an authenticated client."""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    device_ids = args.device_id
+
+    if args.command == "list" or not device_ids or len(args.profile) > 1:
+        result, error, elapsed = await timed(semaphore, timings, profile, api.get_devices)
+        if error:
+            raise RuntimeError(f"Listing devices failed for profile {profile}: {error}")
+        if args.command == "list":
+            for device in result:
+                output.write({
+                    "profile": profile,
+                    "device_id": device.get("id"),
+                    "name": device.get("name"),
+                    "type": device.get("type"),
+                    "model": device.get("model"),
+                    "elapsed_ms": round(elapsed * 1000),
+                })
+            return []
+        if device_ids:
+            # With several profiles, only act on the devices this account owns
+            owned = {device.get("id") for device in result}
+            device_ids = [device_id for device_id in device_ids if device_id in owned]
+        else:
+            device_ids = [device["id"] for device in result if device.get("type") == "lock" and device.get("id")]
+
+    if args.command == "status":
+        tasks = [timed(semaphore, timings, profile, api.get_device_status, device_id) for device_id in device_ids]
+    else:
+        command = api.lock if args.command == "lock" else api.unlock
+        tasks = [timed(semaphore, timings, profile, command, device_id) for device_id in device_ids]
+
+    # Pair each task with its device so rows can be written as they finish
+    async def tagged(device_id, task):
+        return device_id, await task
+
+    for finished in asyncio.as_completed([tagged(d, t) for d, t in zip(device_ids, tasks)]):
+        device_id, (result, error, elapsed) = await finished
+        row = {"profile": profile, "device_id": device_id, "elapsed_ms": round(elapsed * 1000)}
+        if args.command == "status":
+            row.update(
+                ok=bool(result) and not error,
+                online=(result or {}).get("online"),
+                lock_state=lock_state(result or {}),
+                error=error,
+            )
+        else:
+            row.update(command=args.command, ok=bool(result) and not error, error=error)
+        output.write(row)
+    return device_ids
+
+
+def login(api_module, const, args, profile, settings, token_cache):
+    """Run the authorization code flow for a profile and cache its tokens."""
+    params = {
+        "response_type": "code",
+        "client_id": settings.get("client_id"),
+        "scope": const.OAUTH_SCOPE,
+        "redirect_uri": const.OAUTH_REDIRECT_URI,
+        "state": str(uuid.uuid4()),
+    }
+    print(f"Authorize {profile} in your browser:\n{OAUTH_AUTHORIZE_URL}?{urllib.parse.urlencode(params)}")
+    code = input("Authorization code: ").strip()
+
+    api = api_module.UtecLockApi(settings.get("client_id"), settings.get("client_secret"))
+    response = api.session.post(OAUTH_TOKEN_URL, data={
+        "grant_type": "authorization_code",
+        "client_id": settings.get("client_id"),
+        "client_secret": settings.get("client_secret"),
+        "code": code,
+    })
+    response.raise_for_status()
+    result = response.json()
+    api.access_token = result.get("access_token")
+    api.refresh_token = result.get("refresh_token")
+    if result.get("expires_in"):
+        api.token_expires_at = time.time() + result["expires_in"]
+    token_cache.update(profile, api)
+    print(f"Tokens for {profile} saved to {token_cache.path}")
+
+
+async def run(args):
+    """Run the command for every selected profile concurrently."""
+    api_module = import_integration_module("api")
+    const = import_integration_module("const")
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    token_cache = TokenCache(args.token_cache)
+    for profile in args.profile:
+        if profile not in config:
+            raise SystemExit(f"Profile {profile!r} not found in {args.config}")
+
+    if args.command == "login":
+        for profile in args.profile:
+            login(api_module, const, args, profile, config[profile], token_cache)
+        token_cache.save()
+        return 0
+
+    output = Output(args.format, FIELDS[args.command])
+    timings = Timings()
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            run_profile(api_module, args, profile, config[profile], token_cache, output, timings)
+            for profile in args.profile
+        ),
+        return_exceptions=True,
+    )
+    token_cache.save()
+
+    failed = 0
+    handled = set()
+    for profile, result in zip(args.profile, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.error("%s: %s", profile, result)
+        else:
+            handled.update(result)
+
+    if args.command != "list" and len(args.profile) > 1 and not failed:
+        for device_id in args.device_id:
+            if device_id not in handled:
+                output.write({
+                    "device_id": device_id,
+                    "command": args.command,
+                    "ok": False,
+                    "error": "not found in any selected profile",
+                })
+
+    if args.timing:
+        for line in timings.summary():
+            print(line, file=sys.stderr)
+        print(f"total: {time.monotonic() - started:.2f} s", file=sys.stderr)
+    return 1 if failed or output.failures else 0
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["login", "list", "status", "lock", "unlock"])
+    parser.add_argument("device_id", nargs="*", help="devices to act on (default: all locks for status)")
+    parser.add_argument("-p", "--profile", action="append", help="profile to use, may be repeated (default: all)")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="profiles INI file")
+    parser.add_argument("--token-cache", default=DEFAULT_TOKEN_CACHE, help="token cache file")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="parallel requests per profile")
+    parser.add_argument("--all", action="store_true", help="allow lock/unlock of every lock in the profile")
+    parser.add_argument("--timing", action="store_true", help="print a latency summary to stderr")
+    parser.add_argument("--record", metavar="PATH", help="record redacted traffic to a JSON-lines file")
+    parser.add_argument("--replay", metavar="PATH", help="serve requests from a recorded file")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="replay speed factor, 0 for no delay")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command in ("lock", "unlock") and not args.device_id and not args.all:
+        parser.error(f"{args.command} needs device IDs or --all")
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    return args
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()]
+    )
+
+    if not args.profile:
+        config = configparser.ConfigParser()
+        config.read(args.config)
+        args.profile = config.sections()
+        if not args.profile:
+            raise SystemExit(f"No profiles found in {args.config}")
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()